@@ -0,0 +1,222 @@
+"""
+Parsers that extract arXiv IDs, or full metadata records, from a search
+results page.
+
+`fast` scans the HTML once with precompiled regular expressions and is the
+default. `bs4` builds a full BeautifulSoup tree and is kept as the reference
+implementation and fallback. `lxml` is available when lxml is installed.
+
+A record is a dict with the keys id, version, title, authors, abstract,
+primary_category and submitted (an ISO date when it can be parsed).
+"""
+import re
+from datetime import datetime
+from html import unescape
+from importlib.util import find_spec
+
+# BeautifulSoup and lxml are imported by the parsers that use them, so that
+# loading this module (for example for the CLI's --parser choices) stays cheap
+HAVE_LXML = find_spec('lxml') is not None  # lxml is optional
+
+_RESULT_START = re.compile(r'<li\b[^>]*\bclass\s*=\s*"[^"]*\barxiv-result\b[^"]*"[^>]*>', re.IGNORECASE)
+_ID_LINK = re.compile(r'<a\b[^>]*>(arXiv:[^<]*)</a>')
+_TAG = re.compile(r'<[^>]+>')
+_TITLE = re.compile(r'<p\b[^>]*\bclass="title\b[^"]*"[^>]*>(.*?)</p>', re.DOTALL)
+_AUTHORS = re.compile(r'<p\b[^>]*\bclass="authors\b[^"]*"[^>]*>(.*?)</p>', re.DOTALL)
+_AUTHOR_LINK = re.compile(r'<a\b[^>]*>(.*?)</a>', re.DOTALL)
+_ABSTRACT_FULL = re.compile(
+    r'<span\b[^>]*\bclass="abstract-full\b[^"]*"[^>]*\bid="([^"]*)-abstract-full"[^>]*>(.*?)</p>', re.DOTALL)
+_LESS_LINK = re.compile(r'<a\b[^>]*>[^<]*Less</a>')
+_CATEGORY = re.compile(r'<span\b[^>]*\bclass="tag\b[^"]*"[^>]*>([^<]*)</span>')
+_SUBMITTED = re.compile(r'>Submitted</span>([^;<]*)')
+_VERSION = re.compile(r'v(\d+)$')
+
+
+def _id_from_link_text(text):
+    return text.strip().split(':')[-1]
+
+
+def _clean_text(text):
+    """Collapse runs of whitespace (including non-breaking spaces)."""
+    return ' '.join(text.split())
+
+
+def _markup_text(markup):
+    """Text content of an HTML fragment, with whitespace collapsed."""
+    return _clean_text(unescape(_TAG.sub('', markup)))
+
+
+def _iso_date(text):
+    try:
+        return datetime.strptime(text, '%d %B, %Y').date().isoformat()
+    except ValueError:
+        return text or None
+
+
+def _version(abstract_id):
+    match = _VERSION.search(abstract_id or '')
+    return f"v{match.group(1)}" if match else None
+
+
+def _record(arxiv_id, abstract_id, title, authors, abstract, category, submitted):
+    return {
+        'id': arxiv_id,
+        'version': _version(abstract_id),
+        'title': title,
+        'authors': authors,
+        'abstract': abstract,
+        'primary_category': category,
+        'submitted': _iso_date(_clean_text(submitted)) if submitted is not None else None,
+    }
+
+
+def parse_ids_bs4(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    arxiv_ids = []
+    for result in soup.find_all('li', class_='arxiv-result'):
+        id_link = result.find('a', string=re.compile(r'^arXiv:'))
+        if id_link and id_link.string:
+            arxiv_ids.append(_id_from_link_text(id_link.string))
+    return arxiv_ids
+
+
+def parse_records_bs4(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    records = []
+    for result in soup.find_all('li', class_='arxiv-result'):
+        id_link = result.find('a', string=re.compile(r'^arXiv:'))
+        if not (id_link and id_link.string):
+            continue
+        title = result.find('p', class_='title')
+        authors = result.find('p', class_='authors')
+        category = result.find('span', class_='tag')
+        abstract = result.find('span', class_='abstract-full')
+        abstract_id = None
+        if abstract is not None:
+            abstract_id = abstract.get('id', '')[:-len('-abstract-full')]
+            for link in abstract.find_all('a'):
+                if link.get_text().strip().endswith('Less'):
+                    link.decompose()
+        submitted = result.find('span', string='Submitted')
+        records.append(_record(
+            _id_from_link_text(id_link.string),
+            abstract_id,
+            _clean_text(title.get_text()) if title else None,
+            [_clean_text(a.get_text()) for a in authors.find_all('a')] if authors else [],
+            _clean_text(abstract.get_text()) if abstract else None,
+            category.get_text().strip() if category else None,
+            str(submitted.next_sibling).split(';')[0] if submitted and submitted.next_sibling else None,
+        ))
+    return records
+
+
+def _result_segments(html):
+    """Yield the HTML of each result entry, from its <li> to the next one."""
+    starts = [match.end() for match in _RESULT_START.finditer(html)]
+    for i, start in enumerate(starts):
+        end = starts[i + 1] if i + 1 < len(starts) else len(html)
+        yield html[start:end]
+
+
+def parse_ids_fast(html):
+    arxiv_ids = []
+    for segment in _result_segments(html):
+        id_link = _ID_LINK.search(segment)
+        if id_link:
+            arxiv_ids.append(_id_from_link_text(id_link.group(1)))
+    return arxiv_ids
+
+
+def parse_records_fast(html):
+    records = []
+    for segment in _result_segments(html):
+        id_link = _ID_LINK.search(segment)
+        if not id_link:
+            continue
+        title = _TITLE.search(segment)
+        authors = _AUTHORS.search(segment)
+        category = _CATEGORY.search(segment)
+        abstract = _ABSTRACT_FULL.search(segment)
+        submitted = _SUBMITTED.search(segment)
+        records.append(_record(
+            _id_from_link_text(id_link.group(1)),
+            abstract.group(1) if abstract else None,
+            _markup_text(title.group(1)) if title else None,
+            [_markup_text(a) for a in _AUTHOR_LINK.findall(authors.group(1))] if authors else [],
+            _markup_text(_LESS_LINK.sub('', abstract.group(2))) if abstract else None,
+            unescape(category.group(1)).strip() if category else None,
+            unescape(submitted.group(1)) if submitted else None,
+        ))
+    return records
+
+
+def parse_ids_lxml(html):
+    import lxml.html
+
+    tree = lxml.html.fromstring(html)
+    arxiv_ids = []
+    for result in tree.xpath('//li[contains(concat(" ", normalize-space(@class), " "), " arxiv-result ")]'):
+        links = result.xpath('.//a[not(*) and starts-with(text(), "arXiv:")]')
+        if links:
+            arxiv_ids.append(_id_from_link_text(links[0].text))
+    return arxiv_ids
+
+
+def parse_records_lxml(html):
+    import lxml.html
+
+    tree = lxml.html.fromstring(html)
+    records = []
+    for result in tree.xpath('//li[contains(concat(" ", normalize-space(@class), " "), " arxiv-result ")]'):
+        links = result.xpath('.//a[not(*) and starts-with(text(), "arXiv:")]')
+        if not links:
+            continue
+        title = result.find_class('title')
+        authors = result.find_class('authors')
+        category = result.find_class('tag')
+        abstract = next(iter(result.find_class('abstract-full')), None)
+        abstract_id = None
+        if abstract is not None:
+            abstract_id = abstract.get('id', '')[:-len('-abstract-full')]
+            for link in abstract.xpath('.//a'):
+                if link.text_content().strip().endswith('Less'):
+                    link.drop_tree()
+        submitted = result.xpath('.//span[text()="Submitted"]')
+        records.append(_record(
+            _id_from_link_text(links[0].text),
+            abstract_id,
+            _clean_text(title[0].text_content()) if title else None,
+            [_clean_text(a.text_content()) for a in authors[0].xpath('.//a')] if authors else [],
+            _clean_text(abstract.text_content()) if abstract is not None else None,
+            category[0].text_content().strip() if category else None,
+            (submitted[0].tail or '').split(';')[0] if submitted else None,
+        ))
+    return records
+
+
+PARSERS = {
+    'fast': parse_ids_fast,
+    'bs4': parse_ids_bs4,
+}
+RECORD_PARSERS = {
+    'fast': parse_records_fast,
+    'bs4': parse_records_bs4,
+}
+if HAVE_LXML:
+    PARSERS['lxml'] = parse_ids_lxml
+    RECORD_PARSERS['lxml'] = parse_records_lxml
+
+DEFAULT_PARSER = 'fast'
+
+
+def get_parser(name, records=False):
+    """Return the ID parser (or record parser, if `records`) registered under `name`."""
+    registry = RECORD_PARSERS if records else PARSERS
+    try:
+        return registry[name]
+    except KeyError:
+        raise ValueError(f"Unknown parser {name!r}. Available parsers: {sorted(registry)}") from None
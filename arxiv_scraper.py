@@ -1,56 +1,176 @@
 import requests
-from bs4 import BeautifulSoup
-import re
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from arxiv_parsers import DEFAULT_PARSER, get_parser
+from config import ARXIV_BASE_URL
+from http_client import get_session
+from metrics import get_metrics
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Page sizes accepted by the arXiv search form
+ALLOWED_PAGE_SIZES = [25, 50, 100, 200]
+
 class ArxivScraper:
-    def __init__(self, user_agent):
+    def __init__(self, user_agent, session=None, rate_limiter=None, workers=1, cache=None,
+                 parser=DEFAULT_PARSER, metrics=None):
         self.headers = {'User-Agent': user_agent}
-        self.base_url = 'https://arxiv.org'
+        self.base_url = ARXIV_BASE_URL
+        self.session = session or get_session()
+        # Shared TokenBucket pacing every search page request, and the number
+        # of pages fetched concurrently
+        self.rate_limiter = rate_limiter
+        self.workers = max(1, workers)
+        # Optional SearchCache of parsed result pages
+        self.cache = cache
+        # Functions extracting IDs / metadata records from a result page (see arxiv_parsers)
+        self.parse_ids = get_parser(parser)
+        self.parse_records = get_parser(parser, records=True)
+        # Timings and counters of the page requests (see metrics)
+        self.metrics = metrics or get_metrics()
 
     def search(self, query, max_results=50, start=0):
         """
         Searches arXiv for a given query and returns the paper IDs.
         """
-        allowed_sizes = [25, 50, 100, 200]
-        if max_results not in allowed_sizes:
-            logging.warning(f"Invalid size {max_results}. Defaulting to 50. Allowed values are {allowed_sizes}")
-            max_results = 50
+        return list(self.iter_search(query, max_results=max_results, start=start))
+
+    def iter_search(self, query, max_results=50, start=0):
+        """
+        Yield up to `max_results` unique arXiv IDs for `query`, starting at
+        result offset `start`.
+
+        Result pages are fetched concurrently (up to `self.workers` at once)
+        and IDs are yielded as each page arrives, so they are only roughly in
+        the order arXiv lists them.
+        """
+        return self._iter_results(query, max_results, start, records=False)
+
+    def iter_records(self, query, max_results=50, start=0):
+        """
+        Like `iter_search`, but yield metadata records (id, version, title,
+        authors, abstract, primary_category, submitted) parsed from the same
+        result pages.
+        """
+        return self._iter_results(query, max_results, start, records=True)
+
+    def _iter_results(self, query, max_results, start, records):
+        if max_results <= 0:
+            return
+        page_size = next((size for size in ALLOWED_PAGE_SIZES if size >= max_results), ALLOWED_PAGE_SIZES[-1])
+        page_starts = iter(range(start, start + max_results, page_size))
+
+        seen = set()
+        exhausted = False
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {}
+
+            def submit_next():
+                page_start = next(page_starts, None)
+                if page_start is not None:
+                    futures[executor.submit(self._fetch_page, query, page_size, page_start, records)] = page_start
 
+            for _ in range(self.workers):
+                submit_next()
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_start = futures.pop(future)
+                    page_items = future.result()
+                    if page_items is None:
+                        # The request failed; this page is skipped, not treated as the end
+                        if not exhausted:
+                            submit_next()
+                        continue
+                    if len(page_items) < page_size:
+                        # A short page is the last one; later offsets are empty
+                        exhausted = True
+                        if not page_items and page_start == start:
+                            logging.warning("No search results found. The page structure might have changed.")
+                    for item in page_items:
+                        arxiv_id = item['id'] if records else item
+                        if arxiv_id in seen:
+                            continue
+                        seen.add(arxiv_id)
+                        yield item
+                        if len(seen) >= max_results:
+                            for pending in futures:
+                                pending.cancel()
+                            logging.info(f"Found {len(seen)} arXiv IDs.")
+                            return
+                    if not exhausted:
+                        submit_next()
+
+        logging.info(f"Found {len(seen)} arXiv IDs.")
+
+    def _fetch_page(self, query, size, start, records=False):
+        """
+        Fetch one page of search results and return the IDs (or, if `records`,
+        the metadata records) on it, or None if the request failed.
+        """
+        with self.metrics.span("arxiv_search_page", query=query, page_size=size, page_start=start) as span:
+            page_items = self._fetch_page_items(query, size, start, records, span)
+            span["items"] = None if page_items is None else len(page_items)
+        self.metrics.count("arxiv_search_pages_total", result=span["result"])
+        return page_items
+
+    def _fetch_page_items(self, query, size, start, records, span):
+        kind = 'records' if records else 'ids'
         params = {
             'query': query,
             'searchtype': 'all',
             'abstracts': 'show',
             'order': '-announced_date_first',
-            'size': max_results,
+            'size': size,
             'start': start
         }
         search_url = f"{self.base_url}/search/"
+
+        headers = self.headers
+        cached = self.cache.get(query, size, start) if self.cache else None
+        if cached and cached.get(kind) is None:
+            # Cached from an ID-only search; the metadata has to be fetched
+            cached = None
+        if cached:
+            if self.cache.is_fresh(cached):
+                logging.info(f"Using cached search results for params: {params}")
+                span["result"] = "cached"
+                return cached[kind]
+            headers = {**self.headers, **self.cache.conditional_headers(cached)}
+
         logging.info(f"Searching arXiv with URL: {search_url} and params: {params}")
-        
+
+        if self.rate_limiter:
+            with self.metrics.timed("rate_limit_wait_seconds", service="arxiv"):
+                self.rate_limiter.acquire()
         try:
-            response = requests.get(search_url, headers=self.headers, params=params)
+            response = self.session.get(search_url, headers=headers, params=params)
+            span["status"] = response.status_code
+            if response.status_code == 304 and cached:
+                logging.info(f"Cached search results still valid for params: {params}")
+                span["result"] = "revalidated"
+                return self.cache.touch(query, size, start, cached)[kind]
             response.raise_for_status()
         except requests.exceptions.RequestException as e:
             logging.error(f"Failed to fetch search results: {e}")
-            return []
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        search_results = soup.find_all('li', class_='arxiv-result')
-
-        if not search_results:
-            logging.warning("No search results found. The page structure might have changed.")
-            return []
-
-        arxiv_ids = []
-        for result in search_results:
-            id_link = result.find('a', string=re.compile(r'^arXiv:'))
-            if id_link and id_link.string:
-                arxiv_id = id_link.string.strip().split(':')[-1]
-                arxiv_ids.append(arxiv_id)
-        
-        logging.info(f"Found {len(arxiv_ids)} arXiv IDs.")
-        return arxiv_ids
+            span["result"] = "failed"
+            return None
+
+        span["result"] = "fetched"
+        span["bytes"] = len(response.content)
+        self.metrics.count("arxiv_search_bytes_total", len(response.content))
+        if records:
+            page_records = self.parse_records(response.text)
+            arxiv_ids = [record['id'] for record in page_records]
+        else:
+            page_records = None
+            arxiv_ids = self.parse_ids(response.text)
+
+        if self.cache:
+            self.cache.put(query, size, start, arxiv_ids, records=page_records,
+                           etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'))
+        return page_records if records else arxiv_ids
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Compare the arXiv search result parser backends.
+
+Every backend's ID and metadata record parser is first checked against the recorded HTML fixtures in
+benchmarks/fixtures; any disagreement with the BeautifulSoup reference aborts
+the run. Then each backend parses a 200-result page built from the fixture
+entries, and pages per second are reported.
+
+Usage:
+    python benchmarks/bench_arxiv_parsers.py [--seconds 3]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from arxiv_parsers import PARSERS, RECORD_PARSERS  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+REFERENCE = "bs4"
+
+
+def build_large_page(html, results=200):
+    """Repeat the fixture's result entries, renumbering IDs, up to `results` entries."""
+    entries = re.findall(r'<li class="arxiv-result">.*?</li>', html, re.DOTALL)
+    body = []
+    for n in range(results):
+        entry = entries[n % len(entries)]
+        body.append(re.sub(r'\d{4}\.\d{5}', f"2509.{n:05d}", entry))
+    head, tail = html.split('<ol class="breathe-horizontal" start="1">', 1)
+    tail = tail.split('</ol>', 1)[1]
+    return f'{head}<ol class="breathe-horizontal" start="1">\n' + "\n".join(body) + f"\n</ol>{tail}"
+
+
+def check_parity(pages):
+    for name, html in pages.items():
+        for registry in (PARSERS, RECORD_PARSERS):
+            expected = registry[REFERENCE](html)
+            for backend, parse in registry.items():
+                got = parse(html)
+                if got != expected:
+                    sys.exit(f"{backend} disagrees with {REFERENCE} on {name}:\n  {got}\n  {expected}")
+        print(f"{name:<28} {len(expected):4d} results, all backends agree on IDs and records")
+
+
+def pages_per_second(parse, html, seconds):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        parse(html)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=3.0, help="Time spent on each backend.")
+    args = parser.parse_args()
+
+    pages = {path.name: path.read_text(encoding="utf-8") for path in sorted(FIXTURES_DIR.glob("arxiv_search_*.html"))}
+    large_page = build_large_page(pages["arxiv_search_page.html"])
+    pages["synthetic 200 results"] = large_page
+    check_parity(pages)
+
+    print()
+    for label, registry in (("IDs", PARSERS), ("records", RECORD_PARSERS)):
+        rates = {name: pages_per_second(parse, large_page, args.seconds) for name, parse in registry.items()}
+        for name, rate in rates.items():
+            print(f"{label:<8} {name:<6} {rate:10.1f} pages/s   {rate / rates[REFERENCE]:6.1f}x {REFERENCE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Compare the compiled clean_md engine with the legacy clean_markdown.py cleaner.
+
+A synthetic corpus of paper-shaped Markdown files (numbered, roman, lettered
+and plain headings, image links, figure captions, tables, and a references
+section) is written to a temporary directory. Every file is cleaned once by
+each implementation and the outputs are compared byte for byte. Any difference
+aborts the run. The legacy per-line prints go to /dev/null, so the speedup
+shown here excludes terminal I/O and understates the gain of an interactive run.
+
+Usage:
+    python benchmarks/bench_clean_md.py [--files 200] [--seed 0]
+"""
+import argparse
+import contextlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import clean_markdown as legacy  # noqa: E402
+import clean_md  # noqa: E402
+from synthetic import synthetic_paper  # noqa: E402
+
+
+def clean_corpus(clean, sources, target_dir):
+    start = time.perf_counter()
+    for source in sources:
+        clean(source, target_dir / source.name)
+    return time.perf_counter() - start
+
+
+def legacy_clean(source, target):
+    shutil.copyfile(source, target)
+    legacy.clean_markdown_file(str(target))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200, help="Number of synthetic papers.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the corpus.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        corpus, legacy_out, new_out = tmp / "corpus", tmp / "legacy", tmp / "new"
+        for directory in (corpus, legacy_out, new_out):
+            directory.mkdir()
+        sources = []
+        for n in range(args.files):
+            source = corpus / f"{n:05d}.md"
+            source.write_text(synthetic_paper(rng), encoding="utf-8")
+            sources.append(source)
+        size_mb = sum(source.stat().st_size for source in sources) / 1e6
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            legacy_seconds = clean_corpus(legacy_clean, sources, legacy_out)
+        new_seconds = clean_corpus(clean_md.clean_markdown_file, sources, new_out)
+
+        for source in sources:
+            if (legacy_out / source.name).read_bytes() != (new_out / source.name).read_bytes():
+                sys.exit(f"output differs from clean_markdown.py for {source.name}")
+
+    print(f"{args.files} files, {size_mb:.1f} MB, outputs byte-identical")
+    for label, seconds in (("clean_markdown.py", legacy_seconds), ("clean_md", new_seconds)):
+        print(f"{label:<18} {seconds:7.2f} s {args.files / seconds:9.1f} files/s {size_mb / seconds:7.1f} MB/s")
+    print(f"speedup {legacy_seconds / new_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
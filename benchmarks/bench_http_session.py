@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Per-request latency of module-level requests.get versus the shared pooled
+session from http_client, measured against a local keep-alive stub server.
+
+Usage:
+    python benchmarks/bench_http_session.py [--requests 500]
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from http_client import create_session  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = b'{"code": 0, "data": {"extract_result": []}}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(get, url, n):
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = get(url)
+        response.content
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name, latencies):
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:<16} mean {statistics.mean(latencies):7.3f} ms   "
+          f"p50 {statistics.median(latencies):7.3f} ms   p99 {p99:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/v4/extract-results/batch/bench"
+
+    try:
+        unpooled = measure(requests.get, url, args.requests)
+        session = create_session()
+        pooled = measure(session.get, url, args.requests)
+    finally:
+        server.shutdown()
+
+    report("requests.get", unpooled)
+    report("shared session", pooled)
+    print(f"mean latency reduction: "
+          f"{statistics.mean(unpooled) - statistics.mean(pooled):.3f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
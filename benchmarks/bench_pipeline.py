@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark of each pipeline stage against local stand-ins.
+
+The search, download, convert and clean stages each run in their own child
+process, using the real ArxivScraper, PDFDownloader, MinerUConverter and
+clean_md code, against the ArxivStub and MinerUStub servers from
+stub_servers.py and synthetic inputs from synthetic.py. Reported per stage:
+items per second, p50/p99 latency per item, failures, and the child's peak RSS.
+
+Latency is per result page for search, per file for download and clean, and
+for convert the time until the file's MinerU batch returned.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--files 100] [--stages search,download,convert,clean]
+        [--latency 0.02] [--processing-time 1.0] [--failure-rate 0.0] [--error-rate 0.0]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import math
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+sys.path.insert(0, str(BENCH_DIR))
+
+from stub_servers import ArxivStub, MinerUStub  # noqa: E402
+from synthetic import arxiv_id, make_pdf, synthetic_paper  # noqa: E402
+
+STAGES = ["search", "download", "convert", "clean"]
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+# --- Stages (run inside the child process) ---
+
+def stage_search(args, workdir):
+    from arxiv_scraper import ArxivScraper
+    from config import HTTP_HEADERS
+
+    scraper = ArxivScraper(user_agent=HTTP_HEADERS["User-Agent"], workers=args.workers)
+    scraper.base_url = args.arxiv_url
+    latencies = []
+    fetch_page = scraper._fetch_page
+
+    def timed_fetch_page(*a, **kw):
+        page, seconds = timed(fetch_page, *a, **kw)
+        latencies.append(seconds)
+        return page
+
+    scraper._fetch_page = timed_fetch_page
+    ids = scraper.search("synthetic benchmark", max_results=args.files)
+    return {"items": len(ids), "failed": args.files - len(ids), "latencies": latencies, "unit": "results"}
+
+
+def stage_download(args, workdir):
+    from config import HTTP_HEADERS
+    from http_client import configure_session
+    from pdf_downloader import PDFDownloader
+
+    configure_session(pool_maxsize=max(10, args.workers))
+    downloader = PDFDownloader(headers=HTTP_HEADERS, max_per_host=args.workers)
+    downloader.base_url = args.arxiv_url
+    output_dir = workdir / "download"
+    output_dir.mkdir()
+
+    def download(n):
+        return timed(downloader.download_pdf, arxiv_id(n), output_dir, delay=0)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(download, range(args.files)))
+    return {
+        "items": sum(ok for ok, _ in results),
+        "failed": sum(not ok for ok, _ in results),
+        "latencies": [seconds for _, seconds in results],
+        "unit": "files",
+    }
+
+
+def stage_convert(args, workdir):
+    from mineru_converter import MinerUConverter
+    from rate_limiter import InFlightLimiter
+
+    converter = MinerUConverter(
+        "benchmark-token",
+        in_flight_limiter=InFlightLimiter(args.max_in_flight),
+        spool_dir=workdir / "spool",
+    )
+    converter.base_url = args.mineru_url
+    converter.poller.min_interval = args.poll_interval
+    pdfs = sorted((workdir / "pdfs").glob("*.pdf"))
+    output_dir = workdir / "markdown"
+    batches = [pdfs[i:i + args.batch_size] for i in range(0, len(pdfs), args.batch_size)]
+    workers = max(1, math.ceil(args.max_in_flight / args.batch_size))
+
+    def convert(batch):
+        return timed(converter.convert_batch, batch, str(output_dir), batch_size=args.batch_size)
+
+    # The converter reports progress with prints; keep them out of the results
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(convert, batches))
+    outcomes = [(ok, seconds) for batch_results, seconds in results for ok in batch_results.values()]
+    return {
+        "items": sum(ok for ok, _ in outcomes),
+        "failed": sum(not ok for ok, _ in outcomes),
+        "latencies": [seconds for _, seconds in outcomes],
+        "unit": "files",
+    }
+
+
+def stage_clean(args, workdir):
+    from clean_md import clean_markdown_file
+
+    output_dir = workdir / "clean"
+    output_dir.mkdir()
+    latencies = []
+    for source in sorted((workdir / "markdown").glob("*.md")):
+        _, seconds = timed(clean_markdown_file, source, output_dir / source.name)
+        latencies.append(seconds)
+    return {"items": len(latencies), "failed": 0, "latencies": latencies, "unit": "files"}
+
+
+STAGE_FUNCTIONS = {
+    "search": stage_search,
+    "download": stage_download,
+    "convert": stage_convert,
+    "clean": stage_clean,
+}
+
+
+# --- Parent process ---
+
+def prepare_inputs(stage, args, workdir):
+    """Write the synthetic inputs a stage reads, so stages can run independently."""
+    if stage == "convert":
+        (workdir / "pdfs").mkdir()
+        for n in range(args.files):
+            (workdir / "pdfs" / f"{arxiv_id(n)}.pdf").write_bytes(make_pdf(args.pdf_pages, seed=n))
+    elif stage == "clean":
+        (workdir / "markdown").mkdir()
+        rng = random.Random(args.seed)
+        for n in range(args.files):
+            (workdir / "markdown" / f"{arxiv_id(n)}.md").write_text(synthetic_paper(rng), encoding="utf-8")
+
+
+def run_stage(stage, args, arxiv_url, mineru_url):
+    with tempfile.TemporaryDirectory(prefix=f"bench_{stage}_") as workdir:
+        prepare_inputs(stage, args, Path(workdir))
+        result_file = Path(workdir) / "result.json"
+        command = [
+            sys.executable, __file__, "--run-stage", stage, "--workdir", workdir,
+            "--result-file", str(result_file), "--arxiv-url", arxiv_url, "--mineru-url", mineru_url,
+            "--files", str(args.files), "--workers", str(args.workers), "--batch-size", str(args.batch_size),
+            "--max-in-flight", str(args.max_in_flight), "--poll-interval", str(args.poll_interval),
+        ]
+        subprocess.run(command, check=True)
+        return json.loads(result_file.read_text())
+
+
+def child_main(args):
+    logging.disable(logging.CRITICAL)
+    workdir = Path(args.workdir)
+    start = time.perf_counter()
+    result = STAGE_FUNCTIONS[args.run_stage](args, workdir)
+    result["seconds"] = time.perf_counter() - start
+    result["peak_rss_mb"] = peak_rss_mb()
+    Path(args.result_file).write_text(json.dumps(result))
+
+
+def report(stage, result):
+    latencies = result["latencies"] or [0.0]
+    rate = result["items"] / result["seconds"] if result["seconds"] else 0.0
+    print(f"{stage:<9} {result['items']:>6} {result['failed']:>6} {result['seconds']:>8.2f} "
+          f"{rate:>9.1f} {result['unit']:<8} {percentile(latencies, 0.5) * 1000:>9.1f} "
+          f"{percentile(latencies, 0.99) * 1000:>9.1f} {result['peak_rss_mb']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run.")
+    parser.add_argument("--files", type=int, default=100, help="Items per stage.")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent search pages / downloads.")
+    parser.add_argument("--batch-size", type=int, default=10, help="PDFs per MinerU batch.")
+    parser.add_argument("--max-in-flight", type=int, default=20, help="Files converting at the same time.")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="Minimum MinerU poll interval (s).")
+    parser.add_argument("--latency", type=float, default=0.02, help="Added latency per stub request (s).")
+    parser.add_argument("--queue-time", type=float, default=0.0, help="MinerU queueing time per file (s).")
+    parser.add_argument("--processing-time", type=float, default=1.0, help="MinerU processing time per file (s).")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of files MinerU fails.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub requests answered 503.")
+    parser.add_argument("--pdf-pages", type=int, default=10, help="Pages per synthetic PDF.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    # Used internally to run one stage in a child process
+    for name in ("--run-stage", "--workdir", "--result-file", "--arxiv-url", "--mineru-url"):
+        parser.add_argument(name, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        child_main(args)
+        return
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    arxiv = ArxivStub(latency=args.latency, error_rate=args.error_rate, pdf_pages=args.pdf_pages, seed=args.seed)
+    mineru = MinerUStub(latency=args.latency, error_rate=args.error_rate, queue_time=args.queue_time,
+                        processing_time=args.processing_time, failure_rate=args.failure_rate,
+                        pages=args.pdf_pages, seed=args.seed)
+    with arxiv, mineru:
+        print(f"{'stage':<9} {'ok':>6} {'failed':>6} {'seconds':>8} {'rate':>9} {'':<8} "
+              f"{'p50 ms':>9} {'p99 ms':>9} {'RSS MB':>9}")
+        for stage in stages:
+            report(stage, run_stage(stage, args, arxiv.url, mineru.url))
+        requests_served = arxiv.requests + mineru.requests
+    print("\nstub requests: " + ", ".join(f"{key}: {count}" for key, count in sorted(requests_served.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Start-up latency of the CLI, from launch to exit, for `--help` and commands
+that have nothing to do.
+
+Each case runs in a fresh temporary directory (so the relative default paths
+of the commands point at empty inputs) with the arXiv and MinerU endpoints
+pointed at an unused local port, so nothing leaves the machine. The source
+build is `python main.py`; executables built from main.spec (one-file
+dist/main or one-dir dist/main-onedir/main) are measured with --frozen.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--frozen dist/main] [--frozen dist/main-onedir/main]
+        [--output startup.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (name, arguments, files created in the working directory first)
+CASES = [
+    ("--help", ["--help"], {}),
+    ("search --help", ["search", "--help"], {}),
+    ("download --help", ["download", "--help"], {}),
+    ("convert --help", ["convert", "--help"], {}),
+    ("run --help", ["run", "--help"], {}),
+    ("clean --help", ["clean", "--help"], {}),
+    ("index --help", ["index", "--help"], {}),
+    ("query --help", ["query", "--help"], {}),
+    ("search (0 results)", ["search", "none", "--size", "0", "--no-cache"], {}),
+    ("download (no IDs)", ["download"], {"arxiv_ids.txt": ""}),
+    ("convert (no PDFs)", ["convert", "--no-journal", "--no-cache"], {"data/pdfs/": None}),
+    ("clean (no files)", ["clean", "--workers", "1"], {"data/markdown/": None}),
+    ("index (no files)", ["index"], {"data/markdown/": None}),
+]
+
+
+def run_once(command, args, files):
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, content in files.items():
+            path = Path(tmp, name)
+            if content is None:
+                path.mkdir(parents=True, exist_ok=True)
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(content, encoding="utf-8")
+        env = dict(os.environ, ARXIV_BASE_URL="http://127.0.0.1:9", MINERU_BASE_URL="http://127.0.0.1:9")
+        start = time.perf_counter()
+        result = subprocess.run(command + args, cwd=tmp, env=env, capture_output=True)
+        elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(command + args)} exited with {result.returncode}:\n"
+                           f"{result.stderr.decode(errors='replace')}")
+    return elapsed
+
+
+def measure(command, runs):
+    results = {}
+    for name, args, files in CASES:
+        # The first run warms the OS file cache and is not counted
+        run_once(command, args, files)
+        timings = [run_once(command, args, files) for _ in range(runs)]
+        results[name] = {"median_ms": statistics.median(timings), "min_ms": min(timings)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--frozen", action="append", default=[], metavar="PATH",
+                        help="Also measure this PyInstaller executable (may be repeated).")
+    parser.add_argument("--no-source", action="store_true", help="Do not measure `python main.py`.")
+    parser.add_argument("--output", type=str, default=None, help="Also write the results as JSON.")
+    args = parser.parse_args()
+
+    builds = {} if args.no_source else {"source": [sys.executable, str(ROOT / "main.py")]}
+    for path in args.frozen:
+        builds[path] = [str(Path(path).resolve())]
+
+    results = {}
+    for build, command in builds.items():
+        results[build] = measure(command, args.runs)
+        print(f"\n{build} ({args.runs} runs)")
+        print(f"{'case':<20} {'median':>10} {'min':>10}")
+        for name, timing in results[build].items():
+            print(f"{name:<20} {timing['median_ms']:>7.1f} ms {timing['min_ms']:>7.1f} ms")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
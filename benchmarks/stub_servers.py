@@ -0,0 +1,269 @@
+"""
+Local stand-ins for the MinerU API and arXiv, for offline benchmarks.
+
+Each server listens on an ephemeral 127.0.0.1 port in a background thread
+and is used as a context manager:
+
+    with MinerUStub(processing_time=2.0, failure_rate=0.05) as mineru:
+        converter.base_url = mineru.url
+
+Latency, remote processing time and failure rates are configurable, and every
+server counts the requests it answered in `requests` (a Counter keyed by
+endpoint and status code).
+"""
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from synthetic import make_pdf, make_result_zip, make_search_page
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Without this, keep-alive requests stall on Nagle's algorithm + delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status, body=b"", content_type="application/json", headers=None, endpoint=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.stub.count(endpoint or "other", status)
+
+    def drain(self):
+        """Read and discard the request body, so a keep-alive connection stays in sync."""
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining:
+            chunk = self.rfile.read(min(remaining, 1 << 20))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+    def do_GET(self):
+        self.server.stub.handle(self, "GET")
+
+    def do_POST(self):
+        self.server.stub.handle(self, "POST")
+
+    def do_PUT(self):
+        self.server.stub.handle(self, "PUT")
+
+
+class StubServer:
+    """Base class: a threaded HTTP server with injected latency and 503 errors."""
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self.url = None
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, name=type(self).__name__, daemon=True).start()
+        return self
+
+    def close(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def count(self, endpoint, status):
+        with self._lock:
+            self.requests[f"{endpoint} {status}"] += 1
+
+    def random(self):
+        with self._lock:
+            return self._rng.random()
+
+    def handle(self, handler, method):
+        if self.latency:
+            time.sleep(self.latency)
+        endpoint = self.route(method, urlparse(handler.path).path)
+        if endpoint is None:
+            handler.drain()
+            handler.send(404, b"not found", "text/plain")
+            return
+        name, respond, match = endpoint
+        if self.error_rate and self.random() < self.error_rate:
+            handler.drain()
+            handler.send(503, b"service unavailable", "text/plain", endpoint=name)
+            return
+        respond(handler, *match.groups())
+
+    def route(self, method, path):
+        """Return (endpoint name, responder, regex match) for the request, or None."""
+        for route_method, pattern, name, respond in self.routes():
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                return name, respond, match
+        return None
+
+    def routes(self):
+        return []
+
+
+class MinerUStub(StubServer):
+    """
+    Stand-in for the MinerU batch API.
+
+    - POST /api/v4/file-urls/batch creates a batch and returns presigned PUT URLs.
+    - PUT /upload/<batch>/<name> receives a file, which is queued for
+      `queue_time` seconds and then processed for `processing_time` seconds.
+    - GET /api/v4/extract-results/batch/<batch> reports waiting-file, pending,
+      running (with extract_progress), done (with full_zip_url) or failed.
+      A `failure_rate` fraction of files end up failed.
+    - GET /results/<batch>/<name>.zip returns a synthetic result ZIP.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, queue_time=0.0, processing_time=1.0,
+                 failure_rate=0.0, pages=10, images=3, seed=0):
+        super().__init__(latency, error_rate, seed)
+        self.queue_time = queue_time
+        self.processing_time = processing_time
+        self.failure_rate = failure_rate
+        self.pages = pages
+        self.images = images
+        self.batches = {}
+        self.bytes_uploaded = 0
+        self._batch_ids = iter(range(1, 1 << 62))
+
+    def routes(self):
+        return [
+            ("POST", r"/api/v4/file-urls/batch", "file-urls", self._create_batch),
+            ("PUT", r"/upload/([^/]+)/(.+)", "upload", self._upload),
+            ("GET", r"/api/v4/extract-results/batch/([^/]+)", "extract-results", self._batch_status),
+            ("GET", r"/results/([^/]+)/(.+)\.zip", "result-zip", self._result_zip),
+        ]
+
+    def _create_batch(self, handler):
+        request = json.loads(handler.rfile.read(int(handler.headers.get("Content-Length", 0))))
+        names = [entry["name"] for entry in request["files"]]
+        with self._lock:
+            batch_id = f"batch-{next(self._batch_ids)}"
+            self.batches[batch_id] = {name: None for name in names}
+        urls = [f"{self.url}/upload/{batch_id}/{name}" for name in names]
+        handler.send(200, {"code": 0, "msg": "ok", "data": {"batch_id": batch_id, "file_urls": urls}},
+                     endpoint="file-urls")
+
+    def _upload(self, handler, batch_id, name):
+        name = unquote(name)
+        handler.drain()
+        failed = self.random() < self.failure_rate
+        with self._lock:
+            files = self.batches.get(batch_id)
+            if files is None or name not in files:
+                handler.send(404, b"", "text/plain", endpoint="upload")
+                return
+            files[name] = (time.monotonic(), failed)
+            self.bytes_uploaded += int(handler.headers.get("Content-Length", 0))
+        handler.send(200, b"", "text/plain", endpoint="upload")
+
+    def _batch_status(self, handler, batch_id):
+        with self._lock:
+            files = dict(self.batches.get(batch_id) or {})
+        if not files:
+            handler.send(200, {"code": -60012, "msg": "batch not found", "data": None}, endpoint="extract-results")
+            return
+        now = time.monotonic()
+        results = []
+        for name, upload in files.items():
+            entry = {"file_name": name, "err_msg": ""}
+            if upload is None:
+                entry["state"] = "waiting-file"
+            else:
+                uploaded_at, failed = upload
+                elapsed = now - uploaded_at - self.queue_time
+                if elapsed < 0:
+                    entry["state"] = "pending"
+                elif elapsed < self.processing_time:
+                    entry["state"] = "running"
+                    entry["extract_progress"] = {
+                        "extracted_pages": int(self.pages * elapsed / self.processing_time),
+                        "total_pages": self.pages,
+                        "start_time": "",
+                    }
+                elif failed:
+                    entry["state"] = "failed"
+                    entry["err_msg"] = "synthetic failure"
+                else:
+                    entry["state"] = "done"
+                    entry["full_zip_url"] = f"{self.url}/results/{batch_id}/{name}.zip"
+            results.append(entry)
+        handler.send(200, {"code": 0, "msg": "ok", "data": {"batch_id": batch_id, "extract_result": results}},
+                     endpoint="extract-results")
+
+    def _result_zip(self, handler, batch_id, name):
+        handler.send(200, make_result_zip(unquote(name), images=self.images), "application/zip",
+                     endpoint="result-zip")
+
+
+class ArxivStub(StubServer):
+    """
+    Stand-in for arXiv.
+
+    - GET /search/?query=..&size=..&start=.. returns a result page out of
+      `total_results` synthetic papers.
+    - GET /pdf/<id>.pdf returns a synthetic PDF of `pdf_pages` pages and
+      honours single-range Range requests.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, total_results=10_000, pdf_pages=10, seed=0):
+        super().__init__(latency, error_rate, seed)
+        self.total_results = total_results
+        self.pdf_pages = pdf_pages
+
+    def routes(self):
+        return [
+            ("GET", r"/search/?", "search", self._search),
+            ("GET", r"/pdf/(.+)\.pdf", "pdf", self._pdf),
+        ]
+
+    def _search(self, handler):
+        query = parse_qs(urlparse(handler.path).query)
+        page = make_search_page(
+            query.get("query", [""])[0],
+            int(query.get("start", ["0"])[0]),
+            int(query.get("size", ["50"])[0]),
+            self.total_results,
+        )
+        handler.send(200, page.encode(), "text/html; charset=utf-8", endpoint="search")
+
+    def _pdf(self, handler, arxiv_id):
+        body = make_pdf(self.pdf_pages, seed=arxiv_id)
+        match = re.fullmatch(r"bytes=(\d+)-", handler.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            if start >= len(body):
+                handler.send(416, b"", "application/pdf", {"Content-Range": f"bytes */{len(body)}"}, endpoint="pdf")
+                return
+            handler.send(206, body[start:], "application/pdf",
+                         {"Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}"}, endpoint="pdf")
+            return
+        handler.send(200, body, "application/pdf", endpoint="pdf")
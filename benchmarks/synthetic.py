@@ -0,0 +1,171 @@
+"""
+Synthetic inputs for the benchmarks: PDFs, arXiv search result pages,
+MinerU-style result ZIPs and paper-shaped Markdown.
+
+Everything is generated from a seed, so runs are repeatable and need no
+network access or recorded corpus.
+"""
+import io
+import random
+import zipfile
+from html import escape
+
+WORDS = (
+    "model data results method network training layer loss we propose show that the of and "
+    "to in is for on with as by this our performance learning approach table section"
+).split()
+
+CATEGORIES = [("cs.LG", "Machine Learning"), ("cs.CV", "Computer Vision and Pattern Recognition"),
+              ("cs.CL", "Computation and Language"), ("stat.ML", "Machine Learning")]
+
+
+def sentence(rng, words=20):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def arxiv_id(n):
+    """The n-th synthetic arXiv ID."""
+    return f"2509.{n:05d}"
+
+
+def make_pdf(pages=10, seed=0, words_per_page=400):
+    """Return the bytes of a small but well-formed PDF with `pages` pages of text."""
+    rng = random.Random(seed)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for _ in range(pages):
+        text = sentence(rng, words_per_page).replace("\\", "").replace("(", "").replace(")", "")
+        stream = f"BT /F1 10 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _search_entry(n, rng):
+    aid = arxiv_id(n)
+    tags = "\n".join(
+        f'          <span class="tag is-small is-link tooltip is-tooltip-top" data-tooltip="{name}">{code}</span>'
+        for code, name in rng.sample(CATEGORIES, 2)
+    )
+    authors = ",\n".join(
+        f'        <a href="/search/?searchtype=author&amp;query=Author+{k}">Author {k} {n}</a>'
+        for k in range(rng.randint(1, 6))
+    )
+    abstract = escape(sentence(rng, 150))
+    return f"""    <li class="arxiv-result">
+      <div class="is-marginless">
+        <p class="list-title is-inline-block"><a href="https://arxiv.org/abs/{aid}">arXiv:{aid}</a>
+          <span>&nbsp;[<a href="https://arxiv.org/pdf/{aid}">pdf</a>, <a href="https://arxiv.org/format/{aid}">other</a>]&nbsp;</span>
+        </p>
+        <div class="tags is-inline-block">
+{tags}
+        </div>
+      </div>
+      <p class="title is-5 mathjax">
+        {escape(sentence(rng, 9))}
+      </p>
+      <p class="authors">
+        <span class="search-hit">Authors:</span>
+{authors}
+      </p>
+      <p class="abstract mathjax">
+        <span class="has-text-black-bis has-text-weight-semibold">Abstract</span>:
+        <span class="abstract-short has-text-grey-dark mathjax" id="{aid}v1-abstract-short" style="display: inline;">
+          {abstract[:200]}&hellip;
+        </span>
+        <span class="abstract-full has-text-grey-dark mathjax" id="{aid}v1-abstract-full" style="display: none;">
+          {abstract}
+          <a class="is-size-7" style="white-space: nowrap;" onclick="document.getElementById('{aid}v1-abstract-full').style.display = 'none';">&#9651; Less</a>
+        </span>
+      </p>
+      <p class="is-size-7"><span class="has-text-black-bis has-text-weight-semibold">Submitted</span> {rng.randint(1, 28)} September, 2025; <span class="has-text-black-bis has-text-weight-semibold">originally announced</span> September 2025.</p>
+    </li>"""
+
+
+def make_search_page(query, start, size, total):
+    """Return an arXiv search result page listing results start+1 .. start+size of `total`."""
+    end = min(total, start + size)
+    if start >= end:
+        return f"""<!DOCTYPE html>
+<html lang="en"><head><title>Search | arXiv e-print repository</title></head>
+<body><main><div class="content">
+  <h1 class="title is-clearfix">Sorry, your query for all: {escape(query)} produced no results.</h1>
+</div></main></body></html>
+"""
+    entries = "\n".join(_search_entry(n, random.Random(n)) for n in range(start, end))
+    return f"""<!DOCTYPE html>
+<html lang="en"><head><title>Search | arXiv e-print repository</title></head>
+<body><main><div class="content">
+  <h1 class="title is-clearfix">
+    Showing {start + 1}&ndash;{end} of {total:,} results for all: <span class="mathjax">{escape(query)}</span>
+  </h1>
+  <ol class="breathe-horizontal" start="{start + 1}">
+{entries}
+  </ol>
+</div></main></body></html>
+"""
+
+
+def synthetic_paper(rng):
+    """Return one Markdown document shaped like a MinerU conversion."""
+    style = rng.choice(["number", "number", "roman", "plain"])
+    lines = [f"# {sentence(rng, 8)}", "", sentence(rng, 12), "", "# Abstract", "", sentence(rng, 120), ""]
+    for section in range(1, rng.randint(5, 9)):
+        for subsection in range(rng.randint(1, 4)):
+            sub_style = "letter" if style == "roman" and subsection else style
+            lines += [_heading(rng, sub_style, section, subsection), ""]
+            for _ in range(rng.randint(3, 8)):
+                roll = rng.random()
+                if roll < 0.08:
+                    lines.append(f"![](images/{rng.getrandbits(64):016x}.jpg)")
+                elif roll < 0.14:
+                    lines.append(rng.choice(["Figure", "Fig.", "FIG."]) + f" {rng.randint(1, 12)}: {sentence(rng, 15)}")
+                elif roll < 0.18:
+                    lines.append("<table><tr><td>" + "</td><td>".join(WORDS[:8]) + "</td></tr></table>")
+                elif roll < 0.24:
+                    lines.append("$$ \\mathcal{L} = \\sum_i \\log p(x_i) $$")
+                else:
+                    lines.append(sentence(rng, rng.randint(40, 160)))
+                lines.append("")
+    lines += [rng.choice(["# References", "# REFERENCES", "# Acknowledgements"]), ""]
+    lines += [f"[{n}] {sentence(rng, 18)}" for n in range(1, rng.randint(20, 60))]
+    return "\n".join(lines) + "\n"
+
+
+def _heading(rng, style, section, subsection):
+    if style == "number":
+        return f"# {section}.{subsection} {sentence(rng, 3)}" if subsection else f"# {section} {sentence(rng, 2)}"
+    if style == "roman":
+        return f"# {'I II III IV V VI VII VIII IX X'.split()[section % 10]}. {sentence(rng, 2).upper()}"
+    if style == "letter":
+        return f"## {'ABCDEFGH'[subsection % 8]}. {sentence(rng, 3)}"
+    return f"# {sentence(rng, 2)}"
+
+
+def make_result_zip(name, images=3, image_size=20_000):
+    """Return a MinerU-style result ZIP for `name`: full.md, layout.json and images/."""
+    rng = random.Random(name)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("full.md", synthetic_paper(rng))
+        archive.writestr("layout.json", '{"pdf_info": []}')
+        for n in range(images):
+            archive.writestr(f"images/{n:04d}.jpg", rng.randbytes(image_size), compress_type=zipfile.ZIP_STORED)
+    return buffer.getvalue()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Markdown清洗清单（SQLite）
+记录每个源文件的大小、修改时间、内容哈希和清洗时使用的规则版本，
+使重新运行clean时可以跳过未变化的文件，只重新清洗新文件、已修改文件和规则升级后的文件
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+# 攒够这么多条记录提交一次事务，避免逐条fsync
+COMMIT_EVERY = 500
+
+
+class CleanManifest:
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 只在主进程中使用，记录按批次在事务中写入
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._pending = 0
+
+    def load(self):
+        """一次性读出所有记录，返回 {文件名: sqlite3.Row}"""
+        return {row["name"]: row for row in self._conn.execute("SELECT * FROM files")}
+
+    def record(self, name, size, mtime_ns, sha256, version):
+        """记录文件已按 version 版本的规则清洗完成"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (name, size, mtime_ns, sha256, version, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (name, size, mtime_ns, sha256, version, time.time()),
+        )
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.commit()
+
+    def commit(self):
+        self._conn.commit()
+        self._pending = 0
+
+    def close(self):
+        self.commit()
+        self._conn.close()
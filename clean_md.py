@@ -3,9 +3,56 @@
 清洗markdown文档
 删除图片链接和Figure开头的行
 """
+import hashlib
+import os
 import re
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+from clean_manifest import CleanManifest
+from file_hash import file_sha256
+
+# 清洗规则版本：修改任何会改变输出的规则时加一，clean命令会据此重新清洗所有文件
+CLEANER_VERSION = 1
+# clean命令默认的清单文件名（位于输出目录下）
+MANIFEST_NAME = ".clean_manifest.db"
+# 超过该大小（字节）的文件默认流式清洗，不整体读入内存
+STREAMING_THRESHOLD = 32 * 1024 * 1024
+
+# 预编译的正则，行为与逐行调用 re.search/re.match 的旧实现完全一致
+# 图片链接：![...](...)、<img ...>、[image: ...]，三种格式都包含 '[' 或 '<'
+IMAGE_RE = re.compile(r'!\[.*?\]\(.*?\)|<img.*?>|\[image:.*?\]', re.IGNORECASE)
+# 图注：Fig./FIG.数字开头（作用于去掉行首空白后的文本）
+FIGURE_RE = re.compile(r'Fig\.\s*\d+', re.IGNORECASE)
+# 编号标题格式：罗马数字、字母、数字，按此优先级依次尝试
+HEADING_FORMATS = {
+    'roman': r'(?P<roman>[IVX]+)\.?\s+',
+    'letter': r'(?P<letter>[A-Z])\.?\s+',
+    'number': r'(?P<number>\d+(?:[\.\s]+\d+)*?)[\.\s]*\s+',
+}
+FORMAT_RES = {name: re.compile(r'#+\s*' + pattern) for name, pattern in HEADING_FORMATS.items()}
+# 三种格式合并为一个正则，一次匹配即可得到编号类型和标题内容
+HEADING_RE = re.compile(r'(#+)\s*(?:' + '|'.join(HEADING_FORMATS.values()) + r')(?P<title>.*)')
+DIGITS_RE = re.compile(r'\d+')
+# 截断标题：References / Acknowledgements / Appendix 及之后的内容全部删除
+CUTOFF_RE = re.compile(
+    r'\s*#+\s*(?:'
+    r'(?P<references>references\s*[:\.]?\s*$)'
+    r'|(?P<acknowledgements>acknowledg)'
+    r'|(?P<appendix>appendix)'
+    r')',
+    re.IGNORECASE,
+)
+CUTOFF_LOGS = {
+    'references': "📚 发现References标题，删除此处及之后的所有内容",
+    'acknowledgements': "🙏 发现Acknowledgements标题，删除此处及之后的所有内容",
+    'appendix': "📎 发现Appendix标题，删除此处及之后的所有内容",
+}
+
 def show_all_headings(file_path):
     """
     显示markdown文件中所有的标题（以#开头的行）
@@ -42,16 +89,17 @@ def analyze_heading_structure(lines):
     """
     headings = []
     for i, line in enumerate(lines):
-        if line.strip().startswith('#'):
+        stripped = line.strip()
+        if stripped.startswith('#'):
             # 检查标题级别
-            level = len(line.strip()) - len(line.strip().lstrip('#'))
+            level = len(stripped) - len(stripped.lstrip('#'))
             headings.append({
                 'line_index': i,
                 'level': level,
-                'content': line.strip(),
-                'has_roman': bool(re.match(r'^\s*#+\s*([IVX]+)\.?\s+', line.strip())),
-                'has_letter': bool(re.match(r'^\s*#+\s*([A-Z])\.?\s+', line.strip())),
-                'has_number': bool(re.match(r'^\s*#+\s*(\d+(?:[\.\s]+\d+)*?)[\.\s]*\s+', line.strip()))
+                'content': stripped,
+                'has_roman': bool(FORMAT_RES['roman'].match(stripped)),
+                'has_letter': bool(FORMAT_RES['letter'].match(stripped)),
+                'has_number': bool(FORMAT_RES['number'].match(stripped))
             })
     
     # 判断是否所有标题都是一级标题且没有特殊格式
@@ -65,174 +113,386 @@ def analyze_heading_structure(lines):
         'needs_default_adjustment': all_level_1 and no_special_format and len(headings) > 1
     }
 
-def adjust_heading_levels(line):
+def needs_default_adjustment(lines):
+    """
+    判断是否所有标题都是一级标题且无特殊格式（且标题多于一个）
+    与 analyze_heading_structure(lines)['needs_default_adjustment'] 等价，
+    但只检查含 '#' 的行，并在遇到第一个不满足条件的标题时立即返回
+    """
+    count = 0
+    for line in lines:
+        if '#' not in line:
+            continue
+        stripped = line.strip()
+        if not stripped.startswith('#'):
+            continue
+        if stripped[1:2] == '#' or HEADING_RE.match(stripped):
+            return False
+        count += 1
+    return count > 1
+
+def _adjust_heading(heading):
+    """
+    按编号调整标题级别
+    Args:
+        heading (str): 去掉首尾空白的标题行
+    Returns:
+        tuple | None: 需要调整时返回 (调整后的标题行, 编号类型)，否则返回 None
+    """
+    match = HEADING_RE.match(heading)
+    if match is None:
+        return None
+    title = match.group('title')
+    if match.group('roman') is not None:
+        # 罗马数字标题设为二级标题
+        new_level, kind = 2, '罗马数字'
+        new_line = f"## {match.group('roman')}. {title}"
+    elif match.group('letter') is not None:
+        # 字母标题设为三级标题
+        new_level, kind = 3, '字母'
+        new_line = f"### {match.group('letter')} {title}"
+    else:
+        # 根据数字个数确定标题级别（最多5级），数字部分统一为 数字.数字.数字
+        numbers = DIGITS_RE.findall(match.group('number'))
+        new_level, kind = min(len(numbers) + 1, 5), '数字'
+        new_line = f"{'#' * new_level} {'.'.join(numbers)} {title}"
+    if len(match.group(1)) == new_level:
+        return None
+    return new_line, kind
+
+def adjust_heading_levels(line, verbose=False):
     """
     根据标题中数字、罗马数字、字母的个数调整标题级别
     Args:
         line (str): 标题行
+        verbose (bool): 是否打印调整日志
     Returns:
         str: 调整后的标题行
     """
-    # 1. 匹配罗马数字格式：# I. INTRODUCTION, # II. METHODS 等
-    roman_match = re.match(r'^(#+)\s*([IVX]+)\.?\s+(.*)', line.strip())
-    if roman_match:
-        current_hashes, roman, title = roman_match.groups()
-        # 罗马数字标题设为二级标题
-        new_level = 2
-        new_hashes = '#' * new_level
-        new_line = f"{new_hashes} {roman}. {title}"
-        
-        if len(current_hashes) != new_level:
-            print(f"🔧 调整罗马数字标题级别: {line.strip()[:50]}... -> {new_line[:50]}...")
-            return new_line
-        return line
-    
-    # 2. 匹配字母格式：# A anything, # B anything 等
-    letter_match = re.match(r'^(#+)\s*([A-Z])\.?\s+(.*)', line.strip())
-    if letter_match:
-        current_hashes, letter, title = letter_match.groups()
-        # 字母标题设为三级标题
-        new_level = 3
-        new_hashes = '#' * new_level
-        new_line = f"{new_hashes} {letter} {title}"
-        
-        if len(current_hashes) != new_level:
-            print(f"🔧 调整字母标题级别: {line.strip()[:50]}... -> {new_line[:50]}...")
-            return new_line
+    adjusted = _adjust_heading(line.strip())
+    if adjusted is None:
         return line
-    
-    # 3. 匹配数字格式：# 数字[.空格]数字[.空格]数字... 标题内容
-    number_match = re.match(r'^(#+)\s*(\d+(?:[\.\s]+\d+)*?)[\.\s]*\s+(.*)', line.strip())
-    if number_match:
-        current_hashes, numbers_part, title = number_match.groups()
-        
-        # 提取所有数字（忽略点和空格）
-        numbers = re.findall(r'\d+', numbers_part)
-        num_count = len(numbers)
-        
-        # 根据数字个数确定标题级别（最多5级）
-        new_level = min(num_count + 1, 5)
-        new_hashes = '#' * new_level
-        
-        # 重新构建数字部分，使用标准格式（数字.数字.数字）
-        if num_count == 1:
-            formatted_numbers = numbers[0]
-        else:
-            formatted_numbers = '.'.join(numbers)
-        
-        new_line = f"{new_hashes} {formatted_numbers} {title}"
-        
-        if len(current_hashes) != new_level:
-            print(f"🔧 调整数字标题级别: {line.strip()[:50]}... -> {new_line[:50]}...")
-            return new_line
-    
-    return line
+    new_line, kind = adjusted
+    if verbose:
+        print(f"🔧 调整{kind}标题级别: {line.strip()[:50]}... -> {new_line[:50]}...")
+    return new_line
 
-def clean_markdown_file(file_path):
+def _clean_lines(lines, default_adjustment, stats, verbose=False):
     """
-    清洗markdown文件，删除图片链接和Figure开头的行
+    逐行清洗的核心：依次产出清洗后的行，遇到截断标题时停止，不再读取后续行
+    每行先按首字符分流，只有可能命中的行才会进入对应的预编译正则
     Args:
-        file_path (str): markdown文件路径
+        lines (iterable): 不含换行符的行，可以是列表也可以是惰性读取的迭代器
+        default_adjustment (bool): needs_default_adjustment 的结果
+        stats (Counter): 统计信息，原地累加
+        verbose (bool): 是否逐行打印删除和调整日志
     """
-    # 读取文件内容
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    print(f"🚀 开始清洗文件: {file_path}")
-    print(f"📄 原始文件大小: {len(content)} 字符")
-    
-    # 按行分割内容
-    lines = content.split('\n')
-    
-    # 分析标题结构
-    heading_analysis = analyze_heading_structure(lines)
-    if heading_analysis['needs_default_adjustment']:
+    if default_adjustment and verbose:
         print(f"📝 检测到所有标题均为一级标题且无特殊格式，将应用默认调整规则")
     
-    cleaned_lines = []
-    removed_images = 0
-    removed_figures = 0
-    removed_references = False
-    removed_acknowledgements = False
-    removed_appendix = False
-    adjusted_headings = 0
     first_heading_processed = False
-    
     for line in lines:
-        # 检查是否为图片链接行
-        # 匹配 ![...](...)、<img ...>、[image: ...]等格式
-        if re.search(r'!\[.*?\]\(.*?\)|<img.*?>|\[image:.*?\]', line, re.IGNORECASE):
-            removed_images += 1
-            print(f"🖼️ 删除图片链接: {line[:50]}...")
+        # 图片链接行
+        if ('[' in line or '<' in line) and IMAGE_RE.search(line):
+            stats['images'] += 1
+            if verbose:
+                print(f"🖼️ 删除图片链接: {line[:50]}...")
             continue
         
-        # 检查是否为Figure开头的行或Fig./FIG.数字开头的行
-        if (line.strip().startswith('Figure') or 
-            re.match(r'^\s*Fig\.\s*\d+\.?', line, re.IGNORECASE)):
-            removed_figures += 1
-            print(f"📊 删除图注: {line[:50]}...")
+        stripped = line.lstrip()
+        first = stripped[:1]
+        if first != '#':
+            # Figure开头的行或Fig./FIG.数字开头的行
+            if first in ('F', 'f') and (stripped.startswith('Figure') or FIGURE_RE.match(stripped)):
+                stats['figures'] += 1
+                if verbose:
+                    print(f"📊 删除图注: {line[:50]}...")
+                continue
+            yield line
             continue
         
-        # 调整标题级别
-        original_line = line
-        
-        # 如果需要默认调整（所有标题都是一级且无特殊格式）
-        if heading_analysis['needs_default_adjustment'] and line.strip().startswith('#'):
+        # 标题行：调整级别
+        heading = stripped.rstrip()
+        if default_adjustment:
             if not first_heading_processed:
                 # 第一个标题保持一级
                 first_heading_processed = True
-                print(f"🔧 保持第一个标题为一级: {line.strip()[:50]}...")
-            else:
+                if verbose:
+                    print(f"🔧 保持第一个标题为一级: {heading[:50]}...")
+            elif heading.startswith('# '):
                 # 其余标题改为二级
-                if line.strip().startswith('# ') and not line.strip().startswith('## '):
-                    line = '##' + line[1:]
-                    adjusted_headings += 1
-                    print(f"🔧 调整标题为二级: {original_line.strip()[:50]}... -> {line.strip()[:50]}...")
+                line = '##' + line[1:]
+                stats['headings'] += 1
+                if verbose:
+                    print(f"🔧 调整标题为二级: {heading[:50]}... -> {line.strip()[:50]}...")
         else:
-            # 使用原有的标题级别调整逻辑
-            line = adjust_heading_levels(line)
-            if line != original_line:
-                adjusted_headings += 1
+            adjusted = _adjust_heading(heading)
+            if adjusted is not None:
+                new_line, kind = adjusted
+                if verbose:
+                    print(f"🔧 调整{kind}标题级别: {heading[:50]}... -> {new_line[:50]}...")
+                if new_line != line:
+                    stats['headings'] += 1
+                line = new_line
         
         # 在标题调整后检查是否遇到需要删除的部分
-        # 检查是否遇到References标题（不区分大小写，允许冒号等标点）
-        if re.match(r'^\s*#+\s*references\s*[:\.]?\s*$', line, re.IGNORECASE):
-            removed_references = True
-            print(f"📚 发现References标题，删除此处及之后的所有内容: {line[:50]}...")
-            break
-        
-        # 检查是否遇到Acknowledgements标题（不区分大小写）
-        if re.match(r'^\s*#+\s*acknowledg.*\s*[:\.]?\s*$', line, re.IGNORECASE):
-            removed_acknowledgements = True
-            print(f"🙏 发现Acknowledgements标题，删除此处及之后的所有内容: {line[:50]}...")
-            break
+        cutoff = CUTOFF_RE.match(line)
+        if cutoff:
+            stats[cutoff.lastgroup] = 1
+            if verbose:
+                print(f"{CUTOFF_LOGS[cutoff.lastgroup]}: {line[:50]}...")
+            return
         
-        # 检查是否遇到Appendix标题（不区分大小写）
-        if re.match(r'^\s*#+\s*appendix.*', line, re.IGNORECASE):
-            removed_appendix = True
-            print(f"📎 发现Appendix标题，删除此处及之后的所有内容: {line[:50]}...")
-            break
-        
-        # 保留其他行
-        cleaned_lines.append(line)
-    
-    # 重新组合内容
-    cleaned_content = '\n'.join(cleaned_lines)
-    
-    # 写回文件
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(cleaned_content)
-    
-    print(f"✅ 清洗完成!")
-    print(f"📊 统计信息:")
-    print(f"   - 删除图片链接: {removed_images} 个")
-    print(f"   - 删除图注行: {removed_figures} 个")
-    print(f"   - 调整标题级别: {adjusted_headings} 个")
-    print(f"   - 删除References部分: {'是' if removed_references else '否'}")
-    print(f"   - 删除Acknowledgements部分: {'是' if removed_acknowledgements else '否'}")
-    print(f"   - 删除Appendix部分: {'是' if removed_appendix else '否'}")
-    print(f"   - 清洗后大小: {len(cleaned_content)} 字符")
-    print(f"   - 减少内容: {len(content) - len(cleaned_content)} 字符")
+        yield line
+
+def clean_markdown(content, verbose=False):
+    """
+    清洗markdown文本：删除图片链接、图注行，调整标题级别，
+    并删除References/Acknowledgements/Appendix及之后的内容
+    Args:
+        content (str): markdown文本
+        verbose (bool): 是否逐行打印删除和调整日志
+    Returns:
+        tuple: (清洗后的文本, 统计信息 Counter)
+    """
+    lines = content.split('\n')
+    stats = Counter()
+    cleaned_content = '\n'.join(_clean_lines(lines, needs_default_adjustment(lines), stats, verbose))
+    stats['chars_before'] = len(content)
+    stats['chars_after'] = len(cleaned_content)
+    return cleaned_content, stats
+
+def iter_lines(f):
+    """
+    惰性读取文本文件，产出与 f.read().split('\\n') 完全相同的行序列
+    （不含换行符；以换行结尾或文件为空时最后产出一个空行）
+    """
+    last_complete = True
+    for line in f:
+        if line.endswith('\n'):
+            yield line[:-1]
+        else:
+            last_complete = False
+            yield line
+    if last_complete:
+        yield ''
+
+@contextmanager
+def atomic_output(path):
+    """打开同目录下的临时文件供写入，正常退出时原子替换目标文件，出错时删除临时文件"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".part", dir=path.parent)
+    try:
+        with open(fd, 'w', encoding='utf-8') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def write_text_atomic(path, text):
+    """先写入同目录下的临时文件再替换目标文件，中断时不会留下写了一半的输出"""
+    with atomic_output(path) as f:
+        f.write(text)
+
+def clean_markdown_lines(open_lines, stats=None, verbose=False):
+    """
+    对可重复读取的行序列做两遍清洗：第一遍只检查标题行，第二遍惰性产出清洗后的行
+    Args:
+        open_lines (callable): 每次调用返回一个新的行迭代器（不含换行符）
+        stats (Counter): 统计信息，原地累加
+        verbose (bool): 是否逐行打印删除和调整日志
+    Returns:
+        iterator: 清洗后的行
+    """
+    default_adjustment = needs_default_adjustment(open_lines())
+    return _clean_lines(open_lines(), default_adjustment, Counter() if stats is None else stats, verbose)
+
+def write_lines(f, lines):
+    """按 '\\n'.join(lines) 的格式把行写入文本文件，不在内存中拼接整个文档"""
+    lines = iter(lines)
+    first_line = next(lines, None)
+    if first_line is None:
+        return
+    f.write(first_line)
+    for line in lines:
+        f.write('\n')
+        f.write(line)
+
+def clean_markdown_stream(file_path, output_path=None, verbose=False):
+    """
+    流式清洗markdown文件，内存占用与文件大小无关
+    第一遍只检查标题行判断是否需要默认标题调整（遇到不满足条件的标题即停止）；
+    第二遍逐行读取、清洗并写入临时文件，遇到截断标题后不再读取剩余内容，最后原子替换输出文件
+    输出与 clean_markdown_file 完全相同
+    Args:
+        file_path (str): markdown文件路径
+        output_path (str): 清洗结果的保存路径，默认覆盖原文件
+        verbose (bool): 是否逐行打印删除和调整日志
+    Returns:
+        Counter: 统计信息，大小以字节计（bytes_before, bytes_after）
+    """
+    def open_lines():
+        with open(file_path, 'r', encoding='utf-8') as f:
+            yield from iter_lines(f)
+    
+    stats = Counter()
+    stats['bytes_before'] = os.path.getsize(file_path)
+    target = output_path or file_path
+    with atomic_output(target) as dst:
+        write_lines(dst, clean_markdown_lines(open_lines, stats, verbose))
+    stats['bytes_after'] = os.path.getsize(target)
+    return stats
+
+class MarkdownCleaner:
+    """
+    MinerUConverter 的内置后处理钩子：在读取结果ZIP中的Markdown时直接清洗，
+    只把清洗后的版本写入磁盘。多个转换线程可共用一个实例，统计信息累加在 stats 中
+    """
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        # 规则版本变化后转换结果缓存不能再复用，标签会并入缓存键
+        self.cache_tag = f"clean_md-{CLEANER_VERSION}"
+        self.stats = Counter()
+        self._lock = threading.Lock()
+    
+    def __call__(self, open_lines):
+        stats = Counter()
+        yield from clean_markdown_lines(open_lines, stats, self.verbose)
+        stats['files'] += 1
+        with self._lock:
+            self.stats.update(stats)
+
+def clean_markdown_file(file_path, output_path=None, verbose=False, streaming=None):
+    """
+    清洗markdown文件，删除图片链接和Figure开头的行
+    Args:
+        file_path (str): markdown文件路径
+        output_path (str): 清洗结果的保存路径，默认覆盖原文件
+        verbose (bool): 是否打印逐行日志和统计信息
+        streaming (bool): 是否流式清洗，默认在文件超过 STREAMING_THRESHOLD 字节时使用
+    Returns:
+        Counter: 统计信息（images, figures, headings, references, acknowledgements, appendix，
+            以及 chars_before/chars_after，流式清洗时为 bytes_before/bytes_after）
+    """
+    if streaming is None:
+        streaming = os.path.getsize(file_path) > STREAMING_THRESHOLD
+    
+    if verbose:
+        print(f"🚀 开始清洗文件: {file_path}")
+    if streaming:
+        if verbose:
+            print(f"📄 原始文件大小: {os.path.getsize(file_path)} 字节，使用流式清洗")
+        stats = clean_markdown_stream(file_path, output_path, verbose=verbose)
+        size_before, size_after, unit = stats['bytes_before'], stats['bytes_after'], '字节'
+    else:
+        # 读取文件内容
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if verbose:
+            print(f"📄 原始文件大小: {len(content)} 字符")
+        cleaned_content, stats = clean_markdown(content, verbose=verbose)
+        # 写回文件
+        write_text_atomic(output_path or file_path, cleaned_content)
+        size_before, size_after, unit = stats['chars_before'], stats['chars_after'], '字符'
+    
+    if verbose:
+        print(f"✅ 清洗完成!")
+        print(f"📊 统计信息:")
+        print(f"   - 删除图片链接: {stats['images']} 个")
+        print(f"   - 删除图注行: {stats['figures']} 个")
+        print(f"   - 调整标题级别: {stats['headings']} 个")
+        print(f"   - 删除References部分: {'是' if stats['references'] else '否'}")
+        print(f"   - 删除Acknowledgements部分: {'是' if stats['acknowledgements'] else '否'}")
+        print(f"   - 删除Appendix部分: {'是' if stats['appendix'] else '否'}")
+        print(f"   - 清洗后大小: {size_after} {unit}")
+        print(f"   - 减少内容: {size_before - size_after} {unit}")
+    return stats
+
+def _clean_job(job):
+    """
+    进程池中执行的单个清洗任务
+    Args:
+        job (tuple): (源文件路径, 输出文件路径, 上次清洗时的源文件哈希或None)
+    Returns:
+        tuple: (状态, 源文件哈希, 统计信息或错误信息)，状态为 cleaned / unchanged / failed
+    """
+    source, target, known_sha256 = job
+    try:
+        if os.path.getsize(source) > STREAMING_THRESHOLD:
+            # 大文件分块计算哈希并流式清洗，不整体读入内存
+            sha256 = file_sha256(source)
+            if sha256 == known_sha256:
+                return "unchanged", sha256, None
+            return "cleaned", sha256, clean_markdown_stream(source, target)
+        data = Path(source).read_bytes()
+        sha256 = hashlib.sha256(data).hexdigest()
+        if sha256 == known_sha256:
+            # 只有修改时间变了，内容和上次清洗时一样
+            return "unchanged", sha256, None
+        # 与文本模式读取一致：通用换行符转换为 \n
+        content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        cleaned_content, stats = clean_markdown(content)
+        write_text_atomic(target, cleaned_content)
+        return "cleaned", sha256, stats
+    except Exception as e:
+        return "failed", None, str(e)
+
+def clean_directory(input_dir, output_dir, workers=None, manifest_path=None, force=False):
+    """
+    用进程池并行清洗目录下所有markdown文件，输出到另一个目录
+    清单中记录每个源文件的大小、修改时间、哈希和规则版本：大小和修改时间都没变的文件直接跳过，
+    只有修改时间变化的文件在工作进程中比对哈希，内容相同则不重写输出
+    Args:
+        input_dir (str): 待清洗的markdown目录
+        output_dir (str): 清洗结果目录，不能与input_dir相同
+        workers (int): 工作进程数，默认为CPU核数
+        manifest_path (str): 清单文件路径，默认为 output_dir/.clean_manifest.db
+        force (bool): 忽略清单，重新清洗所有文件
+    Returns:
+        Counter: cleaned / skipped / failed 文件数及各文件统计信息之和
+    """
+    input_dir, output_dir = Path(input_dir), Path(output_dir)
+    if input_dir.resolve() == output_dir.resolve():
+        raise ValueError("输出目录不能与输入目录相同")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = CleanManifest(manifest_path or output_dir / MANIFEST_NAME)
+    records = manifest.load()
+    workers = workers or os.cpu_count() or 1
+    
+    summary = Counter()
+    jobs, source_stats = [], {}
+    for source in sorted(input_dir.glob('*.md')):
+        stat = source.stat()
+        target = output_dir / source.name
+        record = records.get(source.name)
+        known_sha256 = None
+        if not force and record is not None and record["version"] == CLEANER_VERSION and target.exists():
+            if record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns:
+                summary['skipped'] += 1
+                continue
+            known_sha256 = record["sha256"]
+        jobs.append((str(source), str(target), known_sha256))
+        source_stats[source.name] = (stat.st_size, stat.st_mtime_ns)
+    
+    try:
+        if jobs:
+            chunksize = max(1, min(64, len(jobs) // (workers * 4)))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for (source, _, _), (state, sha256, result) in zip(jobs, pool.map(_clean_job, jobs, chunksize=chunksize)):
+                    name = Path(source).name
+                    if state == "failed":
+                        summary['failed'] += 1
+                        print(f"❌ 清洗失败: {source}: {result}")
+                        continue
+                    summary['skipped' if state == "unchanged" else 'cleaned'] += 1
+                    if result:
+                        summary.update(result)
+                    size, mtime_ns = source_stats[name]
+                    manifest.record(name, size, mtime_ns, sha256, CLEANER_VERSION)
+    finally:
+        manifest.close()
+    return summary
 
 def main():
     """主函数"""
@@ -248,7 +508,7 @@ def main():
     show_all_headings(file_path)
     
     # 清洗文件
-    clean_markdown_file(file_path)
+    clean_markdown_file(file_path, verbose=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,11 +1,36 @@
 import os
-from dotenv import load_dotenv
+import sys
+from pathlib import Path
 
-load_dotenv()
+
+def _find_dotenv():
+    """
+    Locate the .env file that python-dotenv's load_dotenv() would load: the
+    first one found from this file's directory (the working directory for a
+    frozen build) up to the root.
+    """
+    start = Path.cwd() if getattr(sys, "frozen", False) else Path(__file__).resolve().parent
+    for directory in (start, *start.parents):
+        if (directory / ".env").is_file():
+            return directory / ".env"
+    return None
+
+
+# The settings below are the defaults of the command-line options, so a .env
+# file has to be loaded before the parser is built; python-dotenv is only
+# imported when there is one to load
+_dotenv_path = _find_dotenv()
+if _dotenv_path:
+    from dotenv import load_dotenv
+    load_dotenv(_dotenv_path)
 
 # API Keys
 MINERU_API_TOKEN = os.getenv("MINERU_API_TOKEN")
 
+# Service endpoints (overridable, e.g. to point at a mirror or the benchmark stand-ins)
+MINERU_BASE_URL = os.getenv("MINERU_BASE_URL", "https://mineru.net")
+ARXIV_BASE_URL = os.getenv("ARXIV_BASE_URL", "https://arxiv.org")
+
 # Default paths
 DEFAULT_ID_FILE = "arxiv_ids.txt"
 DEFAULT_PDF_DIR = "data/pdfs"
@@ -15,3 +40,40 @@ DEFAULT_MD_DIR = "data/markdown"
 HTTP_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
+
+# HTTP connection pooling and timeouts (seconds)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+
+# MinerU quota: API requests per minute and files converting at the same time
+MINERU_REQUESTS_PER_MINUTE = int(os.getenv("MINERU_REQUESTS_PER_MINUTE", "60"))
+MINERU_MAX_IN_FLIGHT = int(os.getenv("MINERU_MAX_IN_FLIGHT", "4"))
+
+# Directory where MinerU result ZIPs are spooled while their Markdown is extracted
+MINERU_SPOOL_DIR = os.getenv("MINERU_SPOOL_DIR", "data/spool")
+
+# SQLite journal that lets an interrupted convert run resume without re-uploading
+MINERU_JOURNAL_PATH = os.getenv("MINERU_JOURNAL_PATH", "data/convert_journal.db")
+
+# Local cache of MinerU results keyed by PDF content and request options
+MINERU_CACHE_DIR = os.getenv("MINERU_CACHE_DIR", "data/cache/mineru")
+MINERU_CACHE_MAX_MB = int(os.getenv("MINERU_CACHE_MAX_MB", "5120"))
+
+# Compressed Markdown shards written with --shard-dir: size bound, and format
+# (gz, or zst when the optional zstandard package is installed)
+MARKDOWN_SHARD_MAX_MB = int(os.getenv("MARKDOWN_SHARD_MAX_MB", "256"))
+MARKDOWN_SHARD_FORMATS = ("gz", "zst")
+MARKDOWN_SHARD_FORMAT = os.getenv("MARKDOWN_SHARD_FORMAT", "gz")
+
+# SQLite full-text index of the converted Markdown, built by the index command
+MARKDOWN_INDEX_PATH = os.getenv("MARKDOWN_INDEX_PATH", "data/markdown_index.db")
+
+# arXiv search politeness: pages per minute and concurrent page fetches
+ARXIV_REQUESTS_PER_MINUTE = int(os.getenv("ARXIV_REQUESTS_PER_MINUTE", "20"))
+ARXIV_SEARCH_WORKERS = int(os.getenv("ARXIV_SEARCH_WORKERS", "4"))
+
+# On-disk cache of parsed arXiv search pages
+ARXIV_SEARCH_CACHE_DIR = os.getenv("ARXIV_SEARCH_CACHE_DIR", "data/cache/search")
+ARXIV_SEARCH_CACHE_TTL = int(os.getenv("ARXIV_SEARCH_CACHE_TTL", "3600"))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+MinerU转换结果缓存
+以PDF内容的SHA-256和请求参数为键，保存转换得到的Markdown（及可选的附属文件），
+按总大小做LRU淘汰。同一PDF换了文件名或输出目录再次转换时直接复用结果，不调用API
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+def cache_key(sha256, options):
+    """由PDF的SHA-256和请求参数（dict）计算缓存键"""
+    payload = json.dumps({"sha256": sha256, "options": options}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _tree_size(path):
+    return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+
+
+def _copy_atomic(src, target):
+    """复制文件到目标路径，先写临时文件再原子替换"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_target = target.with_name(f"{target.name}.part")
+    shutil.copyfile(src, tmp_target)
+    os.replace(tmp_target, target)
+
+
+class ConversionCache:
+    def __init__(self, cache_dir, max_bytes):
+        """
+        Args:
+            cache_dir (str): 缓存目录
+            max_bytes (int): 缓存总大小上限（字节），超出时淘汰最久未使用的条目
+        """
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_dir / "index.db"), check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+
+    def _entry_dir(self, key):
+        return self.objects_dir / key[:2] / key
+
+    def _present(self, key):
+        """条目是否存在（调用方持有锁）"""
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None and (self._entry_dir(key) / "full.md").exists()
+
+    def get(self, key, target_md, asset_dir=None, also=None):
+        """
+        命中时把缓存的Markdown复制到target_md（附属文件复制到asset_dir），返回True；
+        未命中返回False。also为 (键, 目标路径) 时，该条目也必须存在才算命中（只计一次），
+        其Markdown一并复制到目标路径
+        """
+        keys = [key] + ([also[0]] if also else [])
+        with self._lock:
+            if not all(self._present(k) for k in keys):
+                self.misses += 1
+                return False
+            self._conn.executemany("UPDATE entries SET last_access = ? WHERE key = ?",
+                                   [(time.time(), k) for k in keys])
+            self.hits += 1
+
+        entry_dir = self._entry_dir(key)
+        _copy_atomic(entry_dir / "full.md", Path(target_md))
+        if also:
+            _copy_atomic(self._entry_dir(also[0]) / "full.md", Path(also[1]))
+        assets = entry_dir / "assets"
+        if asset_dir is not None and assets.is_dir():
+            shutil.copytree(assets, asset_dir, dirs_exist_ok=True)
+        return True
+
+    def put(self, key, md_path, asset_dir=None):
+        """把转换结果存入缓存，然后按LRU淘汰超出上限的条目"""
+        entry_dir = self._entry_dir(key)
+        tmp_dir = entry_dir.with_name(f"{key}.tmp{threading.get_ident()}")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        shutil.copyfile(md_path, tmp_dir / "full.md")
+        if asset_dir is not None and Path(asset_dir).is_dir():
+            shutil.copytree(asset_dir, tmp_dir / "assets")
+        size = _tree_size(tmp_dir)
+
+        if size > self.max_bytes:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        with self._lock:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, size, last_access) VALUES (?, ?, ?)",
+                (key, size, time.time()),
+            )
+            self._evict(keep=key)
+
+    def _evict(self, keep):
+        """删除最久未使用的条目，直到总大小不超过上限（调用方持有锁）"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries WHERE key != ? ORDER BY last_access", (keep,)
+        ).fetchall():
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+"""
+文件内容哈希
+转换任务日志、转换缓存和Markdown清洗共用，按内容判断文件是否变化
+"""
+
+import hashlib
+
+# 计算文件哈希时的读取块大小
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """分块计算文件的SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
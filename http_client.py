@@ -0,0 +1,97 @@
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_READ_TIMEOUT,
+)
+from metrics import get_metrics
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that applies a default (connect, read) timeout to every request
+    that does not pass its own.
+    """
+
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout or (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _record_response(response, *args, **kwargs):
+    """Response hook counting every response by host, method and status code."""
+    get_metrics().count(
+        "http_responses_total",
+        host=urlparse(response.url).netloc,
+        method=response.request.method,
+        status=response.status_code,
+    )
+
+
+def create_session(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                   timeout=None, host_pool_sizes=None):
+    """
+    Create a requests.Session backed by keep-alive connection pools.
+
+    `pool_connections` is the number of hosts whose pools are kept alive and
+    `pool_maxsize` the number of connections kept per host. `host_pool_sizes`
+    maps a URL prefix (e.g. "https://mineru.net") to a dedicated pool size for
+    that host. Every response is counted in the `http_responses_total`
+    metric.
+    """
+    session = requests.Session()
+    session.hooks['response'].append(_record_response)
+    adapter = TimeoutHTTPAdapter(
+        timeout=timeout,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    for prefix, size in (host_pool_sizes or {}).items():
+        if not urlparse(prefix).scheme:
+            prefix = f"https://{prefix}"
+        session.mount(prefix, TimeoutHTTPAdapter(timeout=timeout, pool_connections=1, pool_maxsize=size))
+
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide shared session, creating it on first use.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
+
+
+def configure_session(**kwargs):
+    """
+    Replace the shared session with one built from `create_session(**kwargs)`.
+
+    Call this before constructing the scraper, downloader or converter so they
+    pick up the new pool limits and timeouts.
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+        _shared_session = create_session(**kwargs)
+        return _shared_session
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+MinerU转换任务日志（SQLite）
+记录每个文件的内容哈希、batch_id、上传状态、远端状态、结果URL、输出路径和输出选项，
+使中断后重新运行convert时可以重新接入未完成的batch、跳过已完成文件、只重试失败文件
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# upload_state取值
+UPLOAD_REQUESTED = "requested"
+UPLOAD_DONE = "uploaded"
+UPLOAD_FAILED = "failed"
+
+# remote_state中表示文件已有最终结果的取值；timeout/error表示本地放弃等待，远端可能仍在处理
+REMOTE_DONE = "done"
+REMOTE_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    batch_id TEXT,
+    upload_state TEXT,
+    remote_state TEXT,
+    result_url TEXT,
+    output_path TEXT,
+    output_options TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class JobJournal:
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 多个转换线程共用一个连接，由锁串行化；每条语句自动提交
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            # 旧版本创建的日志没有output_options列
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "output_options" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN output_options TEXT")
+
+    @staticmethod
+    def key(path):
+        return str(Path(path).resolve())
+
+    def get(self, path):
+        """返回文件的记录（sqlite3.Row），没有记录时返回None"""
+        with self._lock:
+            return self._conn.execute("SELECT * FROM jobs WHERE path = ?", (self.key(path),)).fetchone()
+
+    def start(self, path, sha256, batch_id):
+        """文件已分配到batch_id，重置之前的所有状态"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (path, sha256, batch_id, upload_state, remote_state, "
+                "result_url, output_path, output_options, updated_at) VALUES (?, ?, ?, ?, NULL, NULL, NULL, NULL, ?)",
+                (self.key(path), sha256, batch_id, UPLOAD_REQUESTED, time.time()),
+            )
+
+    def update(self, path, **fields):
+        """更新文件记录的部分字段，如 upload_state / remote_state / result_url / output_path / output_options"""
+        if not fields:
+            return
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET {columns}, updated_at = ? WHERE path = ?",
+                (*fields.values(), time.time(), self.key(path)),
+            )
+
+    def plan(self, path, sha256, output_path, output_options=None, exists=None):
+        """
+        判断文件在本次运行中应如何处理
+        
+        Args:
+            path (str): PDF路径
+            sha256 (str): PDF当前内容的SHA-256
+            output_path (str): 本次运行的输出位置，与记录的output_path相同时才可能跳过
+            output_options (str): 本次运行影响输出内容的选项（如后处理钩子），与记录的output_options相同时才可能跳过
+            exists (callable): exists(output_path) 判断输出是否仍然存在，默认检查文件是否存在
+        
+        Returns:
+            tuple: (动作, 记录)，动作为
+                "skip"   - 已按本次运行的选项转换到本次运行的输出位置，且输出仍然存在
+                "attach" - 已上传，远端尚未给出最终结果，重新接入原batch
+                "fetch"  - 远端已完成但结果尚未解压到本次运行的输出位置，直接下载
+                "submit" - 新文件、内容已变化或之前失败，需要重新上传
+        """
+        exists = exists or (lambda output: Path(output).exists())
+        record = self.get(path)
+        if record is None or record["sha256"] != sha256:
+            return "submit", record
+        if (record["output_path"], record["output_options"]) == (output_path, output_options) and exists(output_path):
+            return "skip", record
+        if record["upload_state"] != UPLOAD_DONE or not record["batch_id"]:
+            return "submit", record
+        if record["remote_state"] == REMOTE_DONE and record["result_url"]:
+            return "fetch", record
+        if record["remote_state"] == REMOTE_FAILED:
+            return "submit", record
+        return "attach", record
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,49 +1,88 @@
 
 import argparse
+import json
 import os
 from pathlib import Path
 
 # We will move the core logic of the scripts into functions here
 # For now, we will just define the command structure
 
-from arxiv_scraper import ArxivScraper
-from config import HTTP_HEADERS
+# Only the configuration and the argument parser are loaded at startup. Each
+# command imports the modules it uses (and with them requests, aiohttp or
+# BeautifulSoup), so `--help` and the other commands do not pay for them.
+from arxiv_parsers import DEFAULT_PARSER, PARSERS
+from config import (
+    ARXIV_REQUESTS_PER_MINUTE,
+    ARXIV_SEARCH_CACHE_DIR,
+    ARXIV_SEARCH_CACHE_TTL,
+    ARXIV_SEARCH_WORKERS,
+    HTTP_HEADERS,
+)
 
 def search_arxiv(args):
     """Search arXiv and save the paper IDs to a file."""
+    from arxiv_scraper import ArxivScraper
+    from rate_limiter import TokenBucket
+    from search_cache import SearchCache
+
     print("Searching arXiv...")
-    scraper = ArxivScraper(user_agent=HTTP_HEADERS['User-Agent'])
-    ids = scraper.search(args.query, max_results=args.size)
-    
-    if ids:
-        with open(args.output, 'w') as f:
-            for arxiv_id in ids:
+    scraper = ArxivScraper(
+        user_agent=HTTP_HEADERS['User-Agent'],
+        rate_limiter=TokenBucket(args.requests_per_minute),
+        workers=args.workers,
+        cache=None if args.no_cache else SearchCache(args.cache_dir, args.cache_ttl, refresh=args.refresh),
+        parser=args.parser,
+    )
+
+    # Results are written as each result page arrives
+    count = 0
+    with open(args.output, 'w', encoding='utf-8') as f:
+        if args.format == "jsonl":
+            for record in scraper.iter_records(args.query, max_results=args.size):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                count += 1
+        else:
+            for arxiv_id in scraper.iter_search(args.query, max_results=args.size):
                 f.write(f"{arxiv_id}\n")
-        print(f"Successfully found {len(ids)} IDs and saved them to {args.output}")
+                f.flush()
+                count += 1
+
+    if count:
+        print(f"Successfully found {count} IDs and saved them to {args.output}")
     else:
         print("No IDs found.")
 
 
-from pdf_downloader import PDFDownloader
-from config import HTTP_HEADERS
+from config import HTTP_POOL_MAXSIZE
 
-from pathlib import Path
+def read_arxiv_id(line):
+    """Return the arXiv ID from a line of a plain ID list or a JSONL metadata file."""
+    line = line.strip()
+    if line.startswith('{'):
+        return json.loads(line)['id']
+    return line
 
 def download_pdfs(args):
     """Download PDFs from a list of arXiv IDs."""
+    from http_client import configure_session
+    from pdf_downloader import PDFDownloader
+
     print("Downloading PDFs...")
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    with open(args.input_file, 'r') as f:
-        arxiv_ids = [line.strip() for line in f if line.strip()]
+    with open(args.input_file, 'r', encoding='utf-8') as f:
+        arxiv_ids = [read_arxiv_id(line) for line in f if line.strip()]
 
-    downloader = PDFDownloader(headers=HTTP_HEADERS)
+    # Keep at least one pooled connection per concurrent download
+    configure_session(pool_maxsize=max(HTTP_POOL_MAXSIZE, min(args.workers, args.max_per_host)))
+    downloader = PDFDownloader(headers=HTTP_HEADERS, max_per_host=args.max_per_host)
     successful_downloads = 0
     failed_downloads = 0
 
-    for arxiv_id in arxiv_ids:
-        if downloader.download_pdf(arxiv_id, output_dir):
+    for arxiv_id, success in downloader.download_many(arxiv_ids, output_dir, workers=args.workers):
+        if success:
             successful_downloads += 1
         else:
             failed_downloads += 1
@@ -53,13 +92,24 @@ def download_pdfs(args):
     print(f"  Failed: {failed_downloads}")
 
 
-from mineru_converter import MinerUConverter
-from config import MINERU_API_TOKEN
-import time
-from pathlib import Path
+from config import (
+    MINERU_API_TOKEN,
+    MINERU_CACHE_DIR,
+    MINERU_CACHE_MAX_MB,
+    MINERU_JOURNAL_PATH,
+    MINERU_MAX_IN_FLIGHT,
+    MINERU_REQUESTS_PER_MINUTE,
+    MINERU_SPOOL_DIR,
+    MARKDOWN_SHARD_FORMAT,
+    MARKDOWN_SHARD_FORMATS,
+    MARKDOWN_SHARD_MAX_MB,
+)
 
 def convert_pdfs(args):
     """Batch convert PDFs to Markdown."""
+    from concurrent.futures import as_completed
+    from clean_md import MarkdownCleaner
+
     print("Converting PDFs to Markdown...")
     input_dir = Path(args.input_dir)
     output_dir = Path(args.output_dir)
@@ -70,29 +120,332 @@ def convert_pdfs(args):
         print(f"No PDF files found in {input_dir}")
         return
 
-    converter = MinerUConverter(token=MINERU_API_TOKEN)
+    try:
+        converter = build_converter(
+            args,
+            postprocessors=[MarkdownCleaner()] if args.clean else None,
+            raw_dir=args.raw_dir if args.clean else None,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
     successful_conversions = 0
     failed_conversions = 0
 
-    for i, pdf_file in enumerate(pdf_files, 1):
-        print(f"\n[{i}/{len(pdf_files)}] Processing: {pdf_file.name}")
+    # Every batch is submitted at once to the converter's event loop, so that
+    # while one is being processed remotely the next is uploading and a
+    # finished one is downloading. The in-flight limiter keeps the total
+    # within the quota.
+    batch_size = max(1, args.batch_size)
+    batches = [pdf_files[start:start + batch_size] for start in range(0, len(pdf_files), batch_size)]
+
+    futures = {
+        converter.submit_batch(batch, str(output_dir), batch_size=batch_size): batch
+        for batch in batches
+    }
+    for future in as_completed(futures):
+        batch = futures[future]
         try:
-            if converter.upload_and_convert_pdf(str(pdf_file), str(output_dir)):
-                successful_conversions += 1
-            else:
-                failed_conversions += 1
+            for success in future.result().values():
+                if success:
+                    successful_conversions += 1
+                else:
+                    failed_conversions += 1
         except Exception as e:
-            print(f"An error occurred while converting {pdf_file.name}: {e}")
-            failed_conversions += 1
-        
-        if i < len(pdf_files):
-            print("Waiting 30 seconds before next conversion...")
-            time.sleep(30)
-
+            print(f"An error occurred while converting {', '.join(p.name for p in batch)}: {e}")
+            failed_conversions += len(batch)
+        done = successful_conversions + failed_conversions
+        print(f"\n[{done}/{len(pdf_files)}] Finished: {', '.join(p.name for p in batch)}")
 
     print(f"\nConversion summary:")
     print(f"  Successful: {successful_conversions}")
     print(f"  Failed: {failed_conversions}")
+    close_converter(converter)
+
+
+def build_converter(args, postprocessors=None, raw_dir=None):
+    """Create a MinerUConverter from the options added by add_converter_arguments."""
+    from conversion_cache import ConversionCache
+    from job_journal import JobJournal
+    from mineru_converter import MinerUConverter
+    from rate_limiter import InFlightLimiter, TokenBucket
+    from shard_store import ShardWriter
+
+    return MinerUConverter(
+        token=MINERU_API_TOKEN,
+        rate_limiter=TokenBucket(args.requests_per_minute),
+        in_flight_limiter=InFlightLimiter(args.max_in_flight),
+        spool_dir=args.spool_dir,
+        extra_members=args.extract_members,
+        journal=None if args.no_journal else JobJournal(args.journal),
+        cache=None if args.no_cache else ConversionCache(args.cache_dir, args.cache_max_mb * 1024 * 1024),
+        postprocessors=postprocessors,
+        raw_dir=raw_dir,
+        store=ShardWriter(args.shard_dir, args.shard_max_mb * 1024 * 1024, args.shard_format)
+        if args.shard_dir else None,
+    )
+
+
+def close_converter(converter):
+    """Close the converter with its journal and cache, printing cache and cleaning statistics."""
+    from clean_md import MarkdownCleaner
+
+    for hook in converter.postprocessors:
+        if isinstance(hook, MarkdownCleaner):
+            print(f"  Cleaned on extraction: {hook.stats['files']}")
+            print(f"  Removed image links: {hook.stats['images']}")
+            print(f"  Removed figure captions: {hook.stats['figures']}")
+            print(f"  Adjusted headings: {hook.stats['headings']}")
+    converter.close()
+    if converter.journal:
+        converter.journal.close()
+    if converter.cache:
+        print(f"  Cache hits: {converter.cache.hits}")
+        print(f"  Cache misses: {converter.cache.misses}")
+        converter.cache.close()
+    if converter.store:
+        converter.store.close()
+        print(f"  Markdown stored in shards under {converter.store.shard_dir}")
+
+
+def run_all(args):
+    """Search, download, convert and clean as one streaming pipeline."""
+    import math
+    from arxiv_scraper import ArxivScraper
+    from clean_md import MarkdownCleaner
+    from http_client import configure_session
+    from pdf_downloader import PDFDownloader
+    from pipeline import run_pipeline
+    from rate_limiter import TokenBucket
+    from search_cache import SearchCache
+
+    print("Running search -> download -> convert -> clean pipeline...")
+    # The scraper and downloader take the shared session when constructed, so
+    # it is configured first. MinerU requests go through the converter's own
+    # aiohttp session, so only the downloads size this pool
+    configure_session(pool_maxsize=max(HTTP_POOL_MAXSIZE, args.download_workers))
+    scraper = ArxivScraper(
+        user_agent=HTTP_HEADERS['User-Agent'],
+        rate_limiter=TokenBucket(ARXIV_REQUESTS_PER_MINUTE),
+        workers=ARXIV_SEARCH_WORKERS,
+        cache=SearchCache(ARXIV_SEARCH_CACHE_DIR, ARXIV_SEARCH_CACHE_TTL),
+    )
+    downloader = PDFDownloader(headers=HTTP_HEADERS, max_per_host=args.download_workers)
+    # Markdown is cleaned while it is read from the result ZIP: the cleaned
+    # version goes to --clean-dir and the raw one to --md-dir
+    try:
+        converter = build_converter(args, postprocessors=[MarkdownCleaner()], raw_dir=args.md_dir)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    stats = run_pipeline(
+        scraper.iter_search(args.query, max_results=args.size),
+        downloader,
+        converter,
+        pdf_dir=args.pdf_dir,
+        md_dir=args.clean_dir,
+        download_workers=args.download_workers,
+        # A convert worker blocks on one batch until it is done, so this many
+        # are needed for max_in_flight files to be in flight at once. They
+        # only wait on the converter's event loop; the in-flight limiter, not
+        # the thread count, bounds the load on MinerU
+        convert_workers=max(1, math.ceil(args.max_in_flight / max(1, args.batch_size))),
+        batch_size=args.batch_size,
+        queue_size=args.queue_size,
+    )
+
+    print(f"\nPipeline summary:")
+    for stage in stats:
+        print(f"  {stage.name}: {stage.succeeded} succeeded, {stage.failed} failed")
+    close_converter(converter)
+
+
+def clean_markdown_dir(args):
+    """Clean every Markdown file of a directory in parallel, skipping unchanged files."""
+    from clean_md import clean_directory
+
+    print(f"Cleaning Markdown files from {args.input_dir} into {args.output_dir}...")
+    try:
+        summary = clean_directory(
+            args.input_dir,
+            args.output_dir,
+            workers=args.workers,
+            manifest_path=args.manifest,
+            force=args.force,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    print(f"\nClean summary:")
+    print(f"  Cleaned: {summary['cleaned']}")
+    print(f"  Skipped (unchanged): {summary['skipped']}")
+    print(f"  Failed: {summary['failed']}")
+    if summary['cleaned']:
+        print(f"  Removed image links: {summary['images']}")
+        print(f"  Removed figure captions: {summary['figures']}")
+        print(f"  Adjusted headings: {summary['headings']}")
+
+
+from config import MARKDOWN_INDEX_PATH
+
+def index_markdown(args):
+    """Build or incrementally update the full-text index of the converted Markdown."""
+    from md_index import MarkdownIndex
+
+    input_dir = args.input_dir or (None if args.shard_dir else "data/markdown")
+    print(f"Indexing Markdown into {args.index}...")
+    index = MarkdownIndex(args.index)
+    try:
+        summary = index.update(input_dir=input_dir, shard_dir=args.shard_dir, force=args.force)
+    finally:
+        index.close()
+
+    print(f"\nIndex summary:")
+    print(f"  Indexed: {summary['indexed']} ({summary['sections']} sections)")
+    print(f"  Unchanged: {summary['unchanged']}")
+    print(f"  Removed: {summary['removed']}")
+    print(f"  Failed: {summary['failed']}")
+
+
+def query_index(args):
+    """Search the full-text index and print the best matching sections."""
+    import sqlite3
+    import time
+    from md_index import MarkdownIndex
+
+    if not Path(args.index).exists():
+        print(f"Index {args.index} not found; build it with the index command first.")
+        return
+    index = MarkdownIndex(args.index)
+    try:
+        start = time.perf_counter()
+        hits = index.search(args.query, limit=args.limit, raw=args.raw)
+        elapsed = (time.perf_counter() - start) * 1000
+    except sqlite3.OperationalError as e:
+        print(f"Error: invalid query: {e}")
+        return
+    finally:
+        index.close()
+
+    for rank, hit in enumerate(hits, 1):
+        print(f"{rank:>3}. {hit['name']}  {hit['heading'] or '(preamble)'}")
+        print(f"     {hit['snippet']}")
+    print(f"\n{len(hits)} sections in {elapsed:.1f} ms")
+
+
+def add_converter_arguments(parser):
+    """Add the MinerU conversion options shared by the convert and run commands."""
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Number of PDFs to submit to MinerU per batch (max 200).",
+    )
+    parser.add_argument(
+        "--requests-per-minute",
+        type=int,
+        default=MINERU_REQUESTS_PER_MINUTE,
+        help="Maximum MinerU API requests per minute.",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=MINERU_MAX_IN_FLIGHT,
+        help="Maximum number of files being converted at the same time.",
+    )
+    parser.add_argument(
+        "--spool-dir",
+        type=str,
+        default=MINERU_SPOOL_DIR,
+        help="Directory where result ZIPs are spooled during extraction.",
+    )
+    parser.add_argument(
+        "--extract-members",
+        nargs="*",
+        default=[],
+        metavar="PATTERN",
+        help="Glob patterns of extra ZIP members (e.g. 'images/*') to extract to <output-dir>/<stem>/.",
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        default=MINERU_JOURNAL_PATH,
+        help="SQLite job journal used to resume interrupted runs.",
+    )
+    parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Do not record or resume jobs; convert every PDF from scratch.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=MINERU_CACHE_DIR,
+        help="Directory of the conversion result cache.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=MINERU_CACHE_MAX_MB,
+        help="Maximum size of the conversion result cache in MB.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or populate the conversion result cache.",
+    )
+    parser.add_argument(
+        "--shard-dir",
+        type=str,
+        default=None,
+        help="Append the converted Markdown to compressed archive shards in this directory "
+             "instead of keeping one file per paper.",
+    )
+    parser.add_argument(
+        "--shard-format",
+        choices=MARKDOWN_SHARD_FORMATS,
+        default=MARKDOWN_SHARD_FORMAT,
+        help="Compression of the shards: tar.gz, or tar.zst if zstandard is installed.",
+    )
+    parser.add_argument(
+        "--shard-max-mb",
+        type=int,
+        default=MARKDOWN_SHARD_MAX_MB,
+        help="Size in MB at which a shard is closed and a new one started.",
+    )
+
+
+from metrics import configure_metrics, snapshot_path
+
+def add_metrics_argument(parser):
+    """Add the --metrics-out option shared by every command."""
+    parser.add_argument(
+        "--metrics-out",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Write a JSON-lines timeline of timed spans to FILE and a Prometheus-style "
+             "snapshot of counters and histograms next to it (FILE with a .prom suffix).",
+    )
+
+
+def run_command(args):
+    """Run the selected command, recording metrics if --metrics-out is given."""
+    if not args.metrics_out:
+        args.func(args)
+        return
+
+    metrics = configure_metrics(args.metrics_out)
+    try:
+        with metrics.span("command", command=args.command):
+            args.func(args)
+    finally:
+        prometheus_path = snapshot_path(args.metrics_out)
+        metrics.write_prometheus(prometheus_path)
+        metrics.close()
+        print(f"Metrics written to {args.metrics_out} and {prometheus_path}")
 
 
 def main():
@@ -115,6 +468,54 @@ def main():
         default="arxiv_ids.txt",
         help="Output file to save arXiv IDs.",
     )
+    search_parser.add_argument(
+        "--workers",
+        type=int,
+        default=ARXIV_SEARCH_WORKERS,
+        help="Number of result pages fetched concurrently.",
+    )
+    search_parser.add_argument(
+        "--requests-per-minute",
+        type=int,
+        default=ARXIV_REQUESTS_PER_MINUTE,
+        help="Maximum arXiv search page requests per minute.",
+    )
+    search_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=ARXIV_SEARCH_CACHE_DIR,
+        help="Directory of the search result cache.",
+    )
+    search_parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=ARXIV_SEARCH_CACHE_TTL,
+        help="Seconds a cached result page is used without revalidation.",
+    )
+    search_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the search result cache.",
+    )
+    search_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revalidate every cached result page with arXiv.",
+    )
+    search_parser.add_argument(
+        "--parser",
+        choices=sorted(PARSERS),
+        default=DEFAULT_PARSER,
+        help="Backend used to parse search result pages.",
+    )
+    search_parser.add_argument(
+        "--format",
+        choices=["ids", "jsonl"],
+        default="ids",
+        help="Write bare IDs, or one JSON metadata record (title, authors, abstract, "
+             "primary category, submission date, version) per line.",
+    )
+    add_metrics_argument(search_parser)
     search_parser.set_defaults(func=search_arxiv)
 
     # --- Download Command ---
@@ -133,6 +534,19 @@ def main():
         default="data/pdfs",
         help="Directory to save downloaded PDFs.",
     )
+    download_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of concurrent downloads.",
+    )
+    download_parser.add_argument(
+        "--max-per-host",
+        type=int,
+        default=4,
+        help="Maximum concurrent downloads from the same host.",
+    )
+    add_metrics_argument(download_parser)
     download_parser.set_defaults(func=download_pdfs)
 
     # --- Convert Command ---
@@ -151,10 +565,153 @@ def main():
         default="data/markdown",
         help="Directory to save Markdown files.",
     )
+    convert_parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Clean the Markdown while extracting it, without a separate clean pass.",
+    )
+    convert_parser.add_argument(
+        "--raw-dir",
+        type=str,
+        default=None,
+        help="With --clean, also save the uncleaned Markdown to this directory.",
+    )
+    add_converter_arguments(convert_parser)
+    add_metrics_argument(convert_parser)
     convert_parser.set_defaults(func=convert_pdfs)
 
+    # --- Run Command ---
+    run_parser = subparsers.add_parser(
+        "run", help="Search, download, convert and clean as one streaming pipeline."
+    )
+    run_parser.add_argument("query", type=str, help="The search query.")
+    run_parser.add_argument(
+        "--size", type=int, default=50, help="Number of results to retrieve."
+    )
+    run_parser.add_argument(
+        "--pdf-dir",
+        type=str,
+        default="data/pdfs",
+        help="Directory to save downloaded PDFs.",
+    )
+    run_parser.add_argument(
+        "--md-dir",
+        type=str,
+        default="data/markdown",
+        help="Directory to save the uncleaned Markdown files.",
+    )
+    run_parser.add_argument(
+        "--clean-dir",
+        type=str,
+        default="data/markdown_clean",
+        help="Directory to save cleaned Markdown files.",
+    )
+    run_parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=4,
+        help="Number of concurrent downloads.",
+    )
+    run_parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=16,
+        help="Maximum number of items waiting between two stages.",
+    )
+    add_converter_arguments(run_parser)
+    add_metrics_argument(run_parser)
+    run_parser.set_defaults(func=run_all)
+
+    # --- Clean Command ---
+    clean_parser = subparsers.add_parser(
+        "clean", help="Clean a directory of Markdown files in parallel."
+    )
+    clean_parser.add_argument(
+        "--input-dir",
+        type=str,
+        default="data/markdown",
+        help="Directory containing Markdown files to clean.",
+    )
+    clean_parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="data/markdown_clean",
+        help="Directory to save cleaned Markdown files.",
+    )
+    clean_parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes (defaults to the number of CPUs).",
+    )
+    clean_parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="SQLite manifest of cleaned files (defaults to <output-dir>/.clean_manifest.db).",
+    )
+    clean_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the manifest and clean every file again.",
+    )
+    add_metrics_argument(clean_parser)
+    clean_parser.set_defaults(func=clean_markdown_dir)
+
+    # --- Index Command ---
+    index_parser = subparsers.add_parser(
+        "index", help="Build or update the full-text index of the converted Markdown."
+    )
+    index_parser.add_argument(
+        "--input-dir",
+        type=str,
+        default=None,
+        help="Directory of Markdown files to index (defaults to data/markdown unless --shard-dir is given).",
+    )
+    index_parser.add_argument(
+        "--shard-dir",
+        type=str,
+        default=None,
+        help="Also index the Markdown stored in the shards of this directory (see convert --shard-dir).",
+    )
+    index_parser.add_argument(
+        "--index",
+        type=str,
+        default=MARKDOWN_INDEX_PATH,
+        help="SQLite full-text index file.",
+    )
+    index_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Index every document again, even if it has not changed.",
+    )
+    add_metrics_argument(index_parser)
+    index_parser.set_defaults(func=index_markdown)
+
+    # --- Query Command ---
+    query_parser = subparsers.add_parser(
+        "query", help="Search the full-text index for matching sections."
+    )
+    query_parser.add_argument("query", type=str, help="Words that must all appear in a section.")
+    query_parser.add_argument(
+        "--index",
+        type=str,
+        default=MARKDOWN_INDEX_PATH,
+        help="SQLite full-text index file.",
+    )
+    query_parser.add_argument(
+        "--limit", type=int, default=10, help="Maximum number of sections to print."
+    )
+    query_parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Pass the query to SQLite FTS5 as-is (OR, NOT, NEAR(...), prefix*, \"phrases\").",
+    )
+    add_metrics_argument(query_parser)
+    query_parser.set_defaults(func=query_index)
+
     args = parser.parse_args()
-    args.func(args)
+    run_command(args)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,18 @@
 # -*- mode: python ; coding: utf-8 -*-
+#
+# The default build is a single executable, which unpacks itself into a
+# temporary directory on every start. Build with PDF2MD_ONEDIR=1
+#
+#     PDF2MD_ONEDIR=1 pyinstaller main.spec
+#
+# to get dist/main-onedir/ instead: a directory with the executable
+# (dist/main-onedir/main) next to its libraries, which starts without
+# unpacking anything. It has its own name so that both builds can sit in
+# dist/ side by side. UPX is disabled for that build since decompressing the
+# libraries would cost the time saved.
+import os
+
+ONEDIR = os.environ.get("PDF2MD_ONEDIR", "") not in ("", "0")
 
 
 a = Analysis(
@@ -16,23 +30,51 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='main',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=True,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
+if ONEDIR:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=True,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='main-onedir',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='main',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=True,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Markdown全文索引（SQLite FTS5）
+把转换得到的Markdown按标题切分为章节后建立全文索引，查询时按BM25排序返回命中的章节，
+代替对整个目录的 grep -r
+
+索引可以增量更新：记录每篇文档的大小、修改时间（分片中的文档为所在分片和偏移）和内容哈希，
+重新运行时跳过未变化的文档，只重新索引新增和修改过的文档，并删除源中已不存在的文档
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+from clean_md import adjust_heading_levels
+
+# 章节切分规则版本：修改切分方式时加一，index命令会据此重新索引所有文档
+INDEX_VERSION = 1
+# 攒够这么多篇文档提交一次事务，避免逐条fsync
+COMMIT_EVERY = 200
+# 排序时标题相对正文的权重
+HEADING_WEIGHT = 4.0
+# 查询结果摘要的最大词数
+SNIPPET_TOKENS = 16
+# 标题路径中各级标题的分隔符
+HEADING_SEPARATOR = " › "
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    location TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    doc_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    heading TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_doc ON sections (doc_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS sections_fts USING fts5(
+    heading, body, content='sections', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS sections_ai AFTER INSERT ON sections BEGIN
+    INSERT INTO sections_fts (rowid, heading, body) VALUES (new.id, new.heading, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS sections_ad AFTER DELETE ON sections BEGIN
+    INSERT INTO sections_fts (sections_fts, rowid, heading, body) VALUES ('delete', old.id, old.heading, old.body);
+END;
+INSERT INTO sections_fts (sections_fts, rank) VALUES ('rank', 'bm25({HEADING_WEIGHT}, 1.0)');
+"""
+
+_FENCE_RE = re.compile(r'\s*(```|~~~)')
+_WORD_RE = re.compile(r'\w+')
+
+
+def split_sections(lines):
+    """
+    按标题把Markdown切分为章节，标题级别先经 adjust_heading_levels 按编号统一
+    （与clean命令一致），代码块中以#开头的行不视为标题
+    Args:
+        lines (iterable): 不含换行符的行
+    Yields:
+        tuple: (级别, 标题路径, 正文)；第一个标题之前的内容级别为0、标题路径为空，
+        标题路径由各上级标题和本级标题以 HEADING_SEPARATOR 连接
+    """
+    level, heading, body = 0, "", []
+    parents = []
+    in_fence = False
+    for line in lines:
+        if _FENCE_RE.match(line):
+            in_fence = not in_fence
+        elif not in_fence and line.lstrip().startswith('#'):
+            if heading or any(text.strip() for text in body):
+                yield level, heading, "\n".join(body).strip()
+            adjusted = adjust_heading_levels(line).strip()
+            level = len(adjusted) - len(adjusted.lstrip('#'))
+            title = adjusted[level:].strip()
+            while parents and parents[-1][0] >= level:
+                parents.pop()
+            parents.append((level, title))
+            heading = HEADING_SEPARATOR.join(text for _, text in parents)
+            body = []
+            continue
+        body.append(line)
+    if heading or any(text.strip() for text in body):
+        yield level, heading, "\n".join(body).strip()
+
+
+def plain_query(text):
+    """把普通文本转换为FTS5查询：每个词加引号后取交集，避免标点被当作查询语法"""
+    return " ".join(f'"{word}"' for word in _WORD_RE.findall(text))
+
+
+class MarkdownIndex:
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _documents(self):
+        return {row["name"]: row for row in self._conn.execute(
+            "SELECT id, name, location, size, mtime_ns, sha256, version FROM documents")}
+
+    def _sources(self, input_dir, shard_dir):
+        """
+        依次生成 (文档名, 位置, 大小, 修改时间, 读取内容的函数)
+        文件的文档名为文件名去掉.md，分片中的文档名为文档ID
+        """
+        if input_dir is not None:
+            for path in sorted(Path(input_dir).glob('*.md')):
+                stat = path.stat()
+                yield path.stem, str(path.resolve()), stat.st_size, stat.st_mtime_ns, path.read_bytes
+        if shard_dir is not None:
+            from shard_store import ShardReader
+            reader = ShardReader(shard_dir)
+            for name, (shard_path, offset, _, size) in reader.locations().items():
+                yield name, f"{shard_path.resolve()}@{offset}", size, 0, lambda name=name: reader.get_bytes(name)
+
+    def update(self, input_dir=None, shard_dir=None, force=False):
+        """
+        使索引与 input_dir 中的.md文件和 shard_dir 中的分片一致；文档名相同时以分片中的为准
+        Args:
+            input_dir (str): Markdown目录
+            shard_dir (str): shard_store写入的分片目录
+            force (bool): 忽略已有记录，重新索引所有文档
+        Returns:
+            Counter: indexed / unchanged / removed / failed 文档数和 sections 章节数
+        """
+        records = self._documents()
+        # 同名文档同时出现在目录和分片中时只索引分片中的一份（后出现的为准），
+        # 每次运行选中的是同一份，不会在两者之间来回重新索引
+        sources = {source[0]: source for source in self._sources(input_dir, shard_dir)}
+        summary = Counter()
+        pending = 0
+        for name, location, size, mtime_ns, read in sources.values():
+            record = records.get(name)
+            current = not force and record is not None and record["version"] == INDEX_VERSION
+            if current and (record["location"], record["size"], record["mtime_ns"]) == (location, size, mtime_ns):
+                summary['unchanged'] += 1
+                continue
+            try:
+                data = read()
+            except Exception as e:
+                summary['failed'] += 1
+                print(f"❌ 读取失败: {location}: {e}")
+                continue
+            sha256 = hashlib.sha256(data).hexdigest()
+            if current and record["sha256"] == sha256:
+                # 只有修改时间或位置变了，内容和上次索引时一样
+                self._conn.execute(
+                    "UPDATE documents SET location = ?, size = ?, mtime_ns = ? WHERE id = ?",
+                    (location, size, mtime_ns, record["id"]))
+                summary['unchanged'] += 1
+            else:
+                if record is not None:
+                    self._delete(record["id"])
+                summary['sections'] += self._insert(name, location, size, mtime_ns, sha256, data)
+                summary['indexed'] += 1
+            pending += 1
+            if pending >= COMMIT_EVERY:
+                self._conn.commit()
+                pending = 0
+
+        for name, record in records.items():
+            if name not in sources:
+                self._delete(record["id"])
+                summary['removed'] += 1
+        self._conn.commit()
+        return summary
+
+    def _insert(self, name, location, size, mtime_ns, sha256, data):
+        cursor = self._conn.execute(
+            "INSERT INTO documents (name, location, size, mtime_ns, sha256, version, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (name, location, size, mtime_ns, sha256, INDEX_VERSION, time.time()),
+        )
+        # 与文本模式读取一致：通用换行符转换为 \n
+        lines = data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        rows = [(cursor.lastrowid, position, level, heading, body)
+                for position, (level, heading, body) in enumerate(split_sections(lines))]
+        self._conn.executemany(
+            "INSERT INTO sections (doc_id, position, level, heading, body) VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def _delete(self, doc_id):
+        self._conn.execute("DELETE FROM sections WHERE doc_id = ?", (doc_id,))
+        self._conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+    def search(self, query, limit=10, raw=False):
+        """
+        查询章节，按BM25（标题权重 HEADING_WEIGHT）排序
+        Args:
+            query (str): 查询文本；raw为True时按FTS5查询语法解析（支持 OR、NEAR、前缀*等）
+            limit (int): 最多返回的结果数
+        Returns:
+            list[dict]: 每个命中章节的 name / level / heading / snippet / score（越小越相关）
+        Raises:
+            sqlite3.OperationalError: raw查询语法错误
+        """
+        match = query if raw else plain_query(query)
+        if not match:
+            return []
+        rows = self._conn.execute(
+            f"""
+            SELECT d.name, s.level, s.heading, hit.snippet, hit.rank
+            FROM (
+                SELECT rowid, rank, snippet(sections_fts, 1, '[', ']', '…', {SNIPPET_TOKENS}) AS snippet
+                FROM sections_fts WHERE sections_fts MATCH ? ORDER BY rank LIMIT ?
+            ) AS hit
+            JOIN sections AS s ON s.id = hit.rowid
+            JOIN documents AS d ON d.id = s.doc_id
+            ORDER BY hit.rank
+            """,
+            (match, limit),
+        ).fetchall()
+        return [{"name": row[0], "level": row[1], "heading": row[2], "snippet": row[3], "score": row[4]}
+                for row in rows]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,218 @@
+"""
+Timing and counters for the search, download and conversion stages.
+
+Components record into the process-wide `Metrics` returned by `get_metrics()`
+(or one passed to their constructor):
+
+- `span(name, **fields)` times a block. The span is written to the JSON-lines
+  timeline, if one is configured, with its fields, and its duration is added
+  to the `<name>_seconds` histogram.
+- `record_span(name, start, end, **fields)` does the same for an interval
+  measured elsewhere, with `time.monotonic()` start and end times.
+- `observe(name, value, **labels)` adds a value to a labelled histogram
+  without writing to the timeline, and `timed(name, **labels)` observes the
+  duration of a block that way, for frequent waits such as rate limiting.
+- `count(name, value=1, **labels)` increments a labelled counter.
+
+`prometheus_text()` renders the counters and histograms in the Prometheus
+text exposition format.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+# Prefix of every exported metric name
+NAMESPACE = "pdf2md"
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+_shared_metrics = None
+_shared_metrics_lock = threading.Lock()
+
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Metrics:
+    """
+    Thread-safe recorder of spans, counters and histograms.
+
+    With a `timeline_path`, every span is appended to that file as one JSON
+    object per line as soon as it ends, so the timeline of a long run is not
+    held in memory and survives an interrupted run.
+    """
+
+    def __init__(self, timeline_path=None):
+        self.timeline_path = Path(timeline_path) if timeline_path else None
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        # Converts time.monotonic() readings to wall-clock timestamps
+        self._wall_offset = time.time() - time.monotonic()
+        self._timeline = None
+        if self.timeline_path:
+            self.timeline_path.parent.mkdir(parents=True, exist_ok=True)
+            self._timeline = open(self.timeline_path, "w", encoding="utf-8", buffering=1)
+
+    @contextmanager
+    def span(self, name, /, **fields):
+        """
+        Time the enclosed block as span `name`.
+
+        Yields the span's fields as a dict the block may add to (for example
+        the number of bytes transferred). A span left by an exception gets an
+        `error` field with the exception type.
+        """
+        start = time.monotonic()
+        try:
+            yield fields
+        except BaseException as e:
+            fields.setdefault("error", type(e).__name__)
+            raise
+        finally:
+            self.record_span(name, start, time.monotonic(), **fields)
+
+    def record_span(self, name, start, end, /, **fields):
+        """Record a span from `start` to `end`, both `time.monotonic()` readings."""
+        duration = max(0.0, end - start)
+        with self._lock:
+            self._histogram(f"{name}_seconds", ()).observe(duration)
+            if self._timeline:
+                event = {
+                    "name": name,
+                    "start": round(start + self._wall_offset, 6),
+                    "duration": round(duration, 6),
+                    "thread": threading.current_thread().name,
+                    **fields,
+                }
+                self._timeline.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+
+    def observe(self, name, value, /, **labels):
+        """Add `value` (in seconds) to the histogram `name`."""
+        with self._lock:
+            self._histogram(name, _label_key(labels)).observe(value)
+
+    @contextmanager
+    def timed(self, name, /, **labels):
+        """Observe the duration of the enclosed block in the histogram `name`."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - start, **labels)
+
+    def count(self, name, value=1, /, **labels):
+        """Increment the counter `name` by `value`."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _histogram(self, name, label_key):
+        histogram = self._histograms.get((name, label_key))
+        if histogram is None:
+            histogram = self._histograms[(name, label_key)] = _Histogram()
+        return histogram
+
+    def prometheus_text(self):
+        """Return the counters and histograms in the Prometheus text format."""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+            last = None
+            for (name, key), value in counters:
+                metric = f"{NAMESPACE}_{name}"
+                if metric != last:
+                    lines.append(f"# TYPE {metric} counter")
+                    last = metric
+                lines.append(f"{metric}{_format_labels(key)} {value:g}")
+            for (name, key), histogram in histograms:
+                metric = f"{NAMESPACE}_{name}"
+                if metric != last:
+                    lines.append(f"# TYPE {metric} histogram")
+                    last = metric
+                cumulative = 0
+                for bound, bucket in zip([f"{b:g}" for b in BUCKETS] + ["+Inf"], histogram.buckets):
+                    cumulative += bucket
+                    lines.append(f"{metric}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+                lines.append(f"{metric}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write `prometheus_text()` to `path`, replacing the file atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.part")
+        tmp_path.write_text(self.prometheus_text(), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def close(self):
+        with self._lock:
+            if self._timeline:
+                self._timeline.close()
+                self._timeline = None
+
+
+def snapshot_path(timeline_path):
+    """Return where the Prometheus snapshot accompanying `timeline_path` is written."""
+    timeline_path = Path(timeline_path)
+    if timeline_path.suffix == ".prom":
+        return timeline_path.with_name(f"{timeline_path.name}.txt")
+    return timeline_path.with_suffix(".prom")
+
+
+def get_metrics():
+    """
+    Return the process-wide Metrics, creating it on first use. Until
+    `configure_metrics` is called it aggregates without writing a timeline.
+    """
+    global _shared_metrics
+    with _shared_metrics_lock:
+        if _shared_metrics is None:
+            _shared_metrics = Metrics()
+        return _shared_metrics
+
+
+def configure_metrics(timeline_path=None):
+    """
+    Replace the process-wide Metrics with one writing its timeline to
+    `timeline_path`.
+
+    Call this before constructing the scraper, downloader or converter so they
+    record into it.
+    """
+    global _shared_metrics
+    with _shared_metrics_lock:
+        if _shared_metrics is not None:
+            _shared_metrics.close()
+        _shared_metrics = Metrics(timeline_path)
+        return _shared_metrics
@@ -2,28 +2,169 @@
 """
 完整的MinerU PDF转Markdown转换脚本
 包含上传、等待处理、下载和解压功能
+
+AsyncMinerUConverter在一个事件循环中管理所有在途文件（上传、轮询、下载），
+并发数只受配额（限速器、在途文件数）限制，不需要每个文件占用一个线程；
+MinerUConverter是它的同步接口，在后台线程的事件循环中运行。
 """
 
-import requests
-import time
+import asyncio
+import hashlib
+import mmap
+import threading
 import os
 import zipfile
-from pathlib import Path
+import fnmatch
+import shutil
+import tempfile
+from pathlib import Path, PurePosixPath
+import io
 import json
-from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+from functools import partial
+import aiohttp
 
-class MinerUConverter:
-    def __init__(self, token):
+from config import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_POOL_MAXSIZE,
+    HTTP_READ_TIMEOUT,
+    MINERU_BASE_URL,
+    MINERU_SPOOL_DIR,
+)
+from metrics import get_metrics
+from clean_md import atomic_output, iter_lines, write_lines
+from conversion_cache import cache_key
+from file_hash import file_sha256
+from job_journal import REMOTE_FAILED, UPLOAD_DONE, UPLOAD_FAILED
+from mineru_poller import BatchPoller, PollError, TransientPollError
+from rate_limiter import AsyncInFlightLimiter, InFlightLimiter
+
+# MinerU单个batch最多允许的文件数
+MAX_BATCH_SIZE = 200
+# 同时进行的上传数、结果下载数
+MAX_CONCURRENT_UPLOADS = 16
+MAX_CONCURRENT_DOWNLOADS = 16
+# 上传时每块的大小，以及PUT失败后重试的次数
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+UPLOAD_RETRIES = 3
+# 结果ZIP下载遇到暂时性错误后重试的次数
+DOWNLOAD_RETRIES = 3
+# 查询状态时视为暂时性错误、需要重试的HTTP状态码
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+# 流式下载和解压ZIP时的块大小
+ZIP_CHUNK_SIZE = 1024 * 1024
+
+
+def _host(url):
+    return url.host if url.explicit_port is None else f"{url.host}:{url.explicit_port}"
+
+
+async def _record_response(session, context, params):
+    """与http_client的同步会话一致，按主机、方法和状态码统计每个响应"""
+    get_metrics().count("http_responses_total", host=_host(params.url), method=params.method,
+                        status=params.response.status)
+
+
+def create_session():
+    """
+    创建aiohttp会话（须在事件循环中调用）
+    
+    上传和下载分别受MAX_CONCURRENT_UPLOADS / MAX_CONCURRENT_DOWNLOADS限制，
+    连接总数在此之外再给API请求留出HTTP_POOL_MAXSIZE个。
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_end.append(_record_response)
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT_UPLOADS + MAX_CONCURRENT_DOWNLOADS + HTTP_POOL_MAXSIZE),
+        timeout=aiohttp.ClientTimeout(sock_connect=HTTP_CONNECT_TIMEOUT, sock_read=HTTP_READ_TIMEOUT),
+        trace_configs=[trace_config],
+    )
+
+
+class AsyncMinerUConverter:
+    def __init__(self, token, session=None, rate_limiter=None, in_flight_limiter=None, poller=None,
+                 spool_dir=MINERU_SPOOL_DIR, extra_members=None, journal=None, cache=None,
+                 postprocessors=None, raw_dir=None, metrics=None, upload_progress=None, store=None):
         if not token:
             raise ValueError("MinerU API token is required.")
         self.token = token
-        self.base_url = "https://mineru.net"
+        self.base_url = MINERU_BASE_URL
         self.headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {token}"
         }
+        # aiohttp.ClientSession；未指定时在首次请求时创建，close()时关闭
+        self.session = session
+        self._owns_session = session is None
+        # 所有MinerU API调用共享的限速器（TokenBucket），以及同时在途文件数的限制（AsyncInFlightLimiter）
+        self.rate_limiter = rate_limiter
+        self.in_flight_limiter = in_flight_limiter
+        self._upload_slots = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+        self._download_slots = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+        # 上传进度回调：upload_progress(文件名, 已发送字节数, 总字节数)，每发送一块调用一次
+        self.upload_progress = upload_progress
+        # 结果ZIP的暂存目录；除主Markdown外还需解压的成员（glob模式，如 "images/*"）
+        self.spool_dir = Path(spool_dir)
+        self.extra_members = list(extra_members or [])
+        # 可选的任务日志（JobJournal），用于中断后恢复
+        self.journal = journal
+        # 可选的转换结果缓存（ConversionCache）
+        self.cache = cache
+        # 可选的分片存储（shard_store.ShardWriter）：Markdown解压到输出目录后移入分片
+        self.store = store
+        # 影响转换结果的请求参数，同时也是结果缓存键的一部分
+        self.request_options = {
+            "enable_formula": True,
+            "enable_table": True,
+            "is_ocr": True,
+            "language": "auto",
+            "model_version": "vlm",
+        }
+        # 后处理钩子：hook(open_lines) -> 行迭代器，open_lines()每次返回主Markdown的一个新行迭代器；
+        # 按顺序串联，在读取ZIP成员时直接处理，只写入最终结果（如 clean_md.MarkdownCleaner）
+        self.postprocessors = list(postprocessors or [])
+        # 使用后处理钩子时，原始Markdown的保存目录；为None时不保存
+        self.raw_dir = Path(raw_dir) if raw_dir else None
+        # 钩子会改变输出，其标签并入缓存键，避免与未处理的结果混用
+        self._cache_options = dict(self.request_options)
+        if self.postprocessors:
+            self._cache_options["postprocessors"] = [
+                getattr(hook, "cache_tag", getattr(hook, "__name__", type(hook).__name__))
+                for hook in self.postprocessors
+            ]
+        # 同样影响输出的选项记入任务日志，选项不同时不跳过已转换的文件
+        self._output_options = json.dumps({
+            "postprocessors": self._cache_options["postprocessors"],
+            "raw_dir": str(self.raw_dir.resolve()) if self.raw_dir else None,
+        }) if self.postprocessors else None
+        self._file_hashes = {}
+        # 各步骤的耗时和计数（见metrics）
+        self.metrics = metrics or get_metrics()
+        # 所有batch共用一个后台轮询任务
+        self.poller = poller or BatchPoller(self._fetch_batch_status, metrics=self.metrics)
     
-    def upload_and_convert_pdf(self, pdf_path, output_dir="data/01_data/arxiv_md", max_wait_time=600):
+    async def _get_session(self):
+        if self.session is None:
+            self.session = create_session()
+        return self.session
+    
+    async def _api_request(self, method, url, **kwargs):
+        """
+        调用MinerU API；设置了限速器时先取得令牌
+        
+        Returns:
+            tuple: (状态码, 状态码为200时解析出的JSON，否则为None)
+        """
+        if self.rate_limiter:
+            with self.metrics.timed("rate_limit_wait_seconds", service="mineru"):
+                await self.rate_limiter.acquire_async()
+        session = await self._get_session()
+        async with session.request(method, url, headers=self.headers, **kwargs) as response:
+            if response.status != 200:
+                return response.status, None
+            return response.status, await response.json(content_type=None)
+    
+    async def upload_and_convert_pdf(self, pdf_path, output_dir="data/01_data/arxiv_md", max_wait_time=600):
         """
         完整的PDF转换流程：上传 -> 等待处理 -> 下载 -> 解压
         
@@ -35,248 +176,664 @@ class MinerUConverter:
         Returns:
             bool: 转换是否成功
         """
-        pdf_file = Path(pdf_path)
-        if not pdf_file.exists():
-            print(f"❌ PDF文件不存在: {pdf_path}")
-            return False
+        results = await self.convert_batch([pdf_path], output_dir, batch_size=1, max_wait_time=max_wait_time)
+        return results[str(pdf_path)]
+    
+    async def convert_batch(self, pdf_paths, output_dir="data/01_data/arxiv_md", batch_size=10, max_wait_time=600):
+        """
+        批量转换PDF：每批申请N个上传URL -> 并发上传 -> 统一轮询 -> 逐个下载解压
+        
+        各批并发进行，同时在途的文件数由in_flight_limiter限制。
+        设置了结果缓存（cache）时，内容和请求参数相同的PDF直接使用缓存结果；
+        设置了任务日志（journal）时，已完成的文件直接跳过，已上传但未完成的文件重新接入原batch，
+        只有新文件和失败的文件会重新上传。
+        
+        Args:
+            pdf_paths (list): PDF文件路径列表
+            output_dir (str): 输出目录
+            batch_size (int): 每批文件数（MinerU单批最多200个）
+            max_wait_time (int): 每批的最大等待时间（秒）
         
-        print(f"🚀 开始转换PDF: {pdf_file.name}")
+        Returns:
+            dict: {PDF路径: 转换是否成功}
+        """
+        results = {}
+        if self.cache:
+            pdf_paths = await self._serve_from_cache(pdf_paths, output_dir, results)
+        if self.journal:
+            pdf_paths = await self._resume_from_journal(pdf_paths, output_dir, max_wait_time, results)
+        
+        async def convert(batch):
+            async with self._in_flight(len(batch)):
+                return await self._convert_one_batch(batch, output_dir, max_wait_time)
         
+        for batch_results in await asyncio.gather(*map(convert, self._split_batches(pdf_paths, batch_size))):
+            results.update(batch_results)
+        return results
+    
+    @asynccontextmanager
+    async def _in_flight(self, count):
+        """占用count个在途文件名额（未设置限制时不做任何事）"""
+        slots = 0
+        if self.in_flight_limiter:
+            with self.metrics.timed("mineru_in_flight_wait_seconds"):
+                slots = await self.in_flight_limiter.acquire(count)
+        try:
+            yield
+        finally:
+            if slots:
+                await self.in_flight_limiter.release(slots)
+    
+    def _file_sha256(self, pdf_path):
+        """计算PDF的SHA-256；按(路径, 修改时间, 大小)记忆，同一文件只读一次"""
+        stat = os.stat(pdf_path)
+        memo_key = (str(Path(pdf_path).resolve()), stat.st_mtime_ns, stat.st_size)
+        sha256 = self._file_hashes.get(memo_key)
+        if sha256 is None:
+            sha256 = self._file_hashes[memo_key] = file_sha256(pdf_path)
+        return sha256
+    
+    def _cache_key(self, pdf_path, raw=False):
+        """结果缓存键；raw为True时是未经后处理的原始Markdown的键（与不使用钩子时相同）"""
+        return cache_key(self._file_sha256(pdf_path), self.request_options if raw else self._cache_options)
+    
+    def _raw_path(self, file_stem):
+        """原始Markdown的保存路径；不使用后处理钩子或未设置raw_dir时为None"""
+        if self.postprocessors and self.raw_dir:
+            return self.raw_dir / f"{file_stem}.md"
+        return None
+    
+    async def _serve_from_cache(self, pdf_paths, output_dir, results):
+        """从结果缓存中取出命中的文件，返回未命中、仍需转换的文件列表"""
+        def lookup(pdf_path):
+            if not Path(pdf_path).exists():
+                return False
+            file_stem = Path(pdf_path).stem
+            target_md = Path(output_dir) / f"{file_stem}.md"
+            asset_dir = Path(output_dir) / file_stem if self.extra_members else None
+            # 需要保存原始Markdown时，原始结果也必须在缓存中，否则重新转换
+            raw_md = self._raw_path(file_stem)
+            also = (self._cache_key(pdf_path, raw=True), raw_md) if raw_md else None
+            if not self.cache.get(self._cache_key(pdf_path), target_md, asset_dir, also=also):
+                return False
+            print(f"⚡ 命中转换缓存: {Path(pdf_path).name} -> {target_md}")
+            if self.store:
+                self._store_output(file_stem, target_md)
+            return True
+        
+        # 哈希计算和复制是磁盘操作，放到线程中进行
+        hits = await asyncio.gather(*(asyncio.to_thread(lookup, pdf_path) for pdf_path in pdf_paths))
+        misses = []
+        for pdf_path, hit in zip(pdf_paths, hits):
+            if hit:
+                self.metrics.count("mineru_files_total", result="cached")
+                results[str(pdf_path)] = True
+            else:
+                misses.append(pdf_path)
+        return misses
+    
+    async def _resume_from_journal(self, pdf_paths, output_dir, max_wait_time, results):
+        """根据任务日志处理已有记录的文件，返回仍需上传的文件列表"""
+        def plan(pdf_path):
+            # 没有记录的文件无论内容如何都要上传，不必先读一遍计算哈希，哈希在上传时顺带算出
+            if not Path(pdf_path).exists() or self.journal.get(pdf_path) is None:
+                return "submit", None
+            output_path = self._output_path(output_dir, Path(pdf_path).stem)
+            return self.journal.plan(pdf_path, self._file_sha256(pdf_path), output_path,
+                                     self._output_options, self._output_exists)
+        
+        plans = await asyncio.gather(*(asyncio.to_thread(plan, pdf_path) for pdf_path in pdf_paths))
+        to_submit = []
+        to_fetch = []
+        to_attach = {}
+        for pdf_path, (action, record) in zip(pdf_paths, plans):
+            if action == "skip":
+                print(f"⏭️ 已转换，跳过: {Path(pdf_path).name}")
+                self.metrics.count("mineru_files_total", result="skipped")
+                results[str(pdf_path)] = True
+            elif action == "fetch":
+                print(f"🔁 远端已完成，直接下载结果: {Path(pdf_path).name}")
+                to_fetch.append((pdf_path, record["result_url"]))
+            elif action == "attach":
+                print(f"🔁 重新接入batch {record['batch_id']}: {Path(pdf_path).name}")
+                to_attach.setdefault(record["batch_id"], {})[Path(pdf_path).name] = pdf_path
+            else:
+                to_submit.append(pdf_path)
+        
+        async def fetch(pdf_path, result_url):
+            if await self._fetch_result(pdf_path, result_url, output_dir):
+                results[str(pdf_path)] = True
+            else:
+                to_submit.append(pdf_path)
+        
+        async def attach(batch_id, files):
+            batch_results = {str(pdf_path): False for pdf_path in files.values()}
+            async with self._in_flight(len(files)):
+                await self._collect_results(batch_id, files, output_dir, max_wait_time, batch_results)
+            results.update(batch_results)
+        
+        await asyncio.gather(
+            *(fetch(pdf_path, result_url) for pdf_path, result_url in to_fetch),
+            *(attach(batch_id, files) for batch_id, files in to_attach.items()),
+        )
+        return to_submit
+    
+    @staticmethod
+    def _split_batches(pdf_paths, batch_size):
+        """按batch_size切分文件列表；同一批内文件名必须唯一，重名时另起一批"""
+        batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        batch, names = [], set()
+        for pdf_path in pdf_paths:
+            name = Path(pdf_path).name
+            if len(batch) >= batch_size or name in names:
+                yield batch
+                batch, names = [], set()
+            batch.append(pdf_path)
+            names.add(name)
+        if batch:
+            yield batch
+    
+    async def _convert_one_batch(self, pdf_paths, output_dir, max_wait_time):
+        """转换一批文件，每个文件的结果在其完成时立即处理"""
+        results = {str(pdf_path): False for pdf_path in pdf_paths}
+        
+        pdf_files = {}
+        for pdf_path in pdf_paths:
+            if not Path(pdf_path).exists():
+                print(f"❌ PDF文件不存在: {pdf_path}")
+                continue
+            pdf_files[Path(pdf_path).name] = pdf_path
+        if not pdf_files:
+            return results
+        
+        print(f"🚀 开始转换PDF: {', '.join(pdf_files)}")
+        with self.metrics.span("mineru_batch", files=len(pdf_files)) as span:
+            span["batch_id"] = await self._run_batch(pdf_files, output_dir, max_wait_time, results)
+            span["converted"] = sum(results.values())
+        return results
+    
+    async def _run_batch(self, pdf_files, output_dir, max_wait_time, results):
+        """申请URL、上传并等待一批文件（{文件名: PDF路径}），结果写入results，返回batch_id"""
         # 步骤1: 申请上传URL
-        batch_id = self._request_upload_urls([pdf_file.name])
+        batch_id, upload_urls = await self._request_upload_urls(list(pdf_files))
         if not batch_id:
-            return False
+            return None
         
-        # 步骤2: 上传PDF文件
-        if not self._upload_pdf_file(batch_id, pdf_path):
-            return False
+        # 步骤2: 并发上传PDF文件；上传时算出的SHA-256直接记入任务日志，不再单独读一遍文件
+        uploaded = {}
         
-        # 步骤3: 等待处理完成
-        download_url = self._wait_for_completion(batch_id, max_wait_time)
-        if not download_url:
-            return False
+        async def upload(name, upload_url):
+            pdf_path = pdf_files[name]
+            sha256 = await self._upload_pdf_file(upload_url, pdf_path)
+            if not sha256:
+                await self._journal_update(pdf_path, upload_state=UPLOAD_FAILED)
+                self.metrics.count("mineru_files_total", result="upload_failed")
+                return
+            if self.journal:
+                await asyncio.to_thread(self._journal_start, pdf_path, sha256, batch_id)
+            uploaded[name] = pdf_path
+        
+        await asyncio.gather(*(upload(name, upload_url) for name, upload_url in zip(pdf_files, upload_urls)))
+        if not uploaded:
+            return batch_id
+        
+        # 步骤3和4: 等待处理完成，每个文件完成后立即下载并解压结果
+        await self._collect_results(batch_id, uploaded, output_dir, max_wait_time, results)
+        return batch_id
+    
+    async def _collect_results(self, batch_id, pdf_files, output_dir, max_wait_time, results):
+        """等待batch内文件（{文件名: PDF路径}）完成，完成的文件立即开始下载解压，结果写入results"""
+        async def fetch(pdf_path, download_url):
+            results[str(pdf_path)] = await self._fetch_result(pdf_path, download_url, output_dir)
         
-        # 步骤4: 下载并解压结果
-        return self._download_and_extract(download_url, pdf_file.stem, output_dir)
+        fetches = []
+        async for file_name, download_url, state in self._wait_for_completion(batch_id, list(pdf_files), max_wait_time):
+            pdf_path = pdf_files[file_name]
+            # 查询出错（如batch已不存在）时下次运行需重新上传；超时则下次重新接入
+            remote_state = REMOTE_FAILED if state == "error" else state
+            await self._journal_update(pdf_path, remote_state=remote_state, result_url=download_url)
+            if download_url:
+                fetches.append(asyncio.create_task(fetch(pdf_path, download_url)))
+            else:
+                self.metrics.count("mineru_files_total", result=state)
+        await asyncio.gather(*fetches)
+    
+    async def _fetch_result(self, pdf_path, download_url, output_dir):
+        """下载并解压单个文件的结果，成功时在任务日志中记录输出路径并存入结果缓存"""
+        file_stem = Path(pdf_path).stem
+        success = await self._download_and_extract(download_url, file_stem, output_dir)
+        self.metrics.count("mineru_files_total", result="converted" if success else "download_failed")
+        if success:
+            target_md = Path(output_dir) / f"{file_stem}.md"
+            if self.cache:
+                asset_dir = Path(output_dir) / file_stem if self.extra_members else None
+                await asyncio.to_thread(
+                    lambda: self.cache.put(self._cache_key(pdf_path), target_md, asset_dir))
+                # 原始Markdown也存入缓存，命中时一并写入raw_dir
+                raw_md = self._raw_path(file_stem)
+                if raw_md:
+                    await asyncio.to_thread(
+                        lambda: self.cache.put(self._cache_key(pdf_path, raw=True), raw_md))
+            if self.store:
+                await asyncio.to_thread(self._store_output, file_stem, target_md)
+            await self._journal_update(pdf_path, output_path=self._output_path(output_dir, file_stem),
+                                       output_options=self._output_options)
+        return success
+    
+    def _output_path(self, output_dir, file_stem):
+        """
+        文件在本次运行中的输出位置，记入任务日志：输出目录中的Markdown文件；
+        使用分片存储时为分片目录下的 <文档ID>.md（分片中的成员名）
+        """
+        if self.store:
+            return str(self.store.shard_dir.resolve() / f"{file_stem}.md")
+        return str((Path(output_dir) / f"{file_stem}.md").resolve())
+    
+    def _output_exists(self, output_path):
+        """任务日志记录的输出（以及需要保存的原始Markdown）是否仍然存在"""
+        file_stem = Path(output_path).stem
+        raw_md = self._raw_path(file_stem)
+        if raw_md and not raw_md.exists():
+            return False
+        if self.store:
+            return file_stem in self.store
+        return Path(output_path).exists()
     
-    def _request_upload_urls(self, file_names):
-        """申请上传URL"""
+    def _store_output(self, file_stem, target_md):
+        """把输出目录中的Markdown移入分片存储，返回所在分片的路径"""
+        shard_path = self.store.add_file(file_stem, target_md)
+        target_md.unlink()
+        print(f"🗄️ 已存入分片: {file_stem} -> {shard_path}")
+        return shard_path
+    
+    async def _journal_update(self, pdf_path, **fields):
+        """更新任务日志；每次写入都会提交到磁盘，放到线程中进行，不阻塞事件循环中的其他文件"""
+        if self.journal:
+            await asyncio.to_thread(self.journal.update, pdf_path, **fields)
+    
+    def _journal_start(self, pdf_path, sha256, batch_id):
+        """上传完成：记录文件所在的batch（重置之前的状态）并标记为已上传"""
+        self.journal.start(pdf_path, sha256, batch_id)
+        self.journal.update(pdf_path, upload_state=UPLOAD_DONE)
+    
+    async def _request_upload_urls(self, file_names):
+        """
+        申请上传URL
+        
+        Returns:
+            tuple: (batch_id, 与file_names一一对应的上传URL列表)，失败时为(None, None)
+        """
         url = f"{self.base_url}/api/v4/file-urls/batch"
         
+        options = self.request_options
         data = {
-            "enable_formula": True,
-            "language": "auto", 
-            "enable_table": True,
-            "files": [{"name": name, "is_ocr": True} for name in file_names],
-            "model_version": "vlm"
+            "enable_formula": options["enable_formula"],
+            "language": options["language"],
+            "enable_table": options["enable_table"],
+            "files": [{"name": name, "is_ocr": options["is_ocr"]} for name in file_names],
+            "model_version": options["model_version"]
         }
         
         try:
             print("📤 申请上传URL...")
-            response = requests.post(url, headers=self.headers, json=data)
+            with self.metrics.span("mineru_request_upload_urls", files=len(file_names)) as span:
+                status, result = await self._api_request("POST", url, json=data)
+                span["status"] = status
             
-            if response.status_code == 200:
-                result = response.json()
+            if status == 200:
                 if result["code"] == 0:
                     batch_id = result["data"]["batch_id"]
                     urls = result["data"]["file_urls"]
                     print(f"✅ 获取上传URL成功，batch_id: {batch_id}")
-                    
-                    # 存储上传URL供后续使用
-                    self.upload_urls = urls
-                    return batch_id
+                    return batch_id, urls
                 else:
                     print(f"❌ 申请上传URL失败: {result.get('msg', 'Unknown error')}")
-                    return None
+                    return None, None
             else:
-                print(f"❌ 请求失败，状态码: {response.status_code}")
-                return None
+                print(f"❌ 请求失败，状态码: {status}")
+                return None, None
                 
         except Exception as e:
             print(f"❌ 申请上传URL异常: {e}")
-            return None
+            return None, None
     
-    def _upload_pdf_file(self, batch_id, pdf_path):
-        """上传PDF文件"""
+    async def _upload_pdf_file(self, upload_url, pdf_path):
+        """
+        上传PDF文件：文件只打开一次并映射到内存，按块直接从映射发送，同一遍中统计字节数；
+        查询缓存或任务日志时没有计算过SHA-256的文件，也在这一遍中计算。PUT失败时从同一映射重试
+        
+        Returns:
+            str: 成功时返回所发送内容的SHA-256（同时记入哈希缓存，供任务日志和结果缓存使用），失败时返回None
+        """
+        name = Path(pdf_path).name
         try:
-            print("📤 上传PDF文件...")
-            
-            with open(pdf_path, 'rb') as f:
-                # 使用第一个上传URL
-                upload_url = self.upload_urls[0]
-                response = requests.put(upload_url, data=f)
-                
-                if response.status_code == 200:
-                    print("✅ PDF文件上传成功")
-                    return True
-                else:
-                    print(f"❌ PDF文件上传失败，状态码: {response.status_code}")
-                    return False
-                    
+            async with self._upload_slots:
+                print(f"📤 上传PDF文件: {name}")
+                session = await self._get_session()
+                with open(pdf_path, 'rb') as f:
+                    stat = os.fstat(f.fileno())
+                    if stat.st_size == 0:
+                        print(f"❌ PDF文件为空: {name}")
+                        return None
+                    # 查询结果缓存或任务日志时已计算过哈希的文件，上传时不再重复计算
+                    memo_key = (str(Path(pdf_path).resolve()), stat.st_mtime_ns, stat.st_size)
+                    known_sha256 = self._file_hashes.get(memo_key)
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    try:
+                        for attempt in range(UPLOAD_RETRIES):
+                            digest = None if known_sha256 else hashlib.sha256()
+                            status = await self._put_mapping(session, upload_url, name, mapping, digest)
+                            if status == 200:
+                                sha256 = known_sha256 or digest.hexdigest()
+                                self._file_hashes[memo_key] = sha256
+                                print(f"✅ PDF文件上传成功: {name} (sha256 {sha256[:12]}…)")
+                                return sha256
+                            if status is not None and status not in TRANSIENT_STATUS_CODES:
+                                print(f"❌ PDF文件上传失败，状态码: {status}")
+                                return None
+                            if attempt < UPLOAD_RETRIES - 1:
+                                print(f"⚠️ PDF文件上传失败（第{attempt + 1}次），稍后重试: {name}")
+                                self.metrics.count("mineru_upload_retries_total")
+                                await asyncio.sleep(attempt + 1)
+                    finally:
+                        try:
+                            mapping.close()
+                        except BufferError:
+                            # 服务端提前响应时发送缓冲区可能仍引用映射，由垃圾回收关闭
+                            pass
+                print(f"❌ PDF文件上传失败，已重试{UPLOAD_RETRIES}次: {name}")
+                return None
+        
         except Exception as e:
             print(f"❌ 上传PDF文件异常: {e}")
-            return False
+            return None
     
-    def _wait_for_completion(self, batch_id, max_wait_time):
-        """等待处理完成"""
-        url = f"{self.base_url}/api/v4/extract-results/batch/{batch_id}"
+    async def _put_mapping(self, session, upload_url, name, mapping, digest=None):
+        """
+        PUT一次映射的全部内容，digest（hashlib对象）不为None时同时用发送的内容更新它
         
-        print(f"⏳ 等待处理完成（最大等待时间: {max_wait_time}秒）...")
-        start_time = time.time()
+        Returns:
+            int: 状态码，网络异常或发送不完整时为None
+        """
+        size = len(mapping)
+        sent = 0
         
-        while time.time() - start_time < max_wait_time:
+        async def chunks():
+            nonlocal sent
+            view = memoryview(mapping)
             try:
-                response = requests.get(url, headers=self.headers)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    if result["code"] == 0:
-                        data = result["data"]
-                        extract_results = data["extract_result"]
-                        
-                        for file_result in extract_results:
-                            state = file_result["state"]
-                            file_name = file_result["file_name"]
-                            
-                            print(f"📊 文件 {file_name} 状态: {state}")
-                            
-                            if state == "done":
-                                download_url = file_result["full_zip_url"]
-                                print(f"✅ 处理完成！下载URL: {download_url}")
-                                return download_url
-                            elif state == "failed":
-                                error_msg = file_result.get("err_msg", "Unknown error")
-                                print(f"❌ 处理失败: {error_msg}")
-                                return None
-                            elif state in ["processing", "pending", "uploaded"]:
-                                # 继续等待
-                                pass
-                    else:
-                        print(f"❌ 查询状态失败: {result.get('msg', 'Unknown error')}")
-                        return None
-                else:
-                    print(f"❌ 查询状态请求失败，状态码: {response.status_code}")
-                    return None
-                    
-            except Exception as e:
-                print(f"❌ 查询状态异常: {e}")
+                for offset in range(0, size, UPLOAD_CHUNK_SIZE):
+                    chunk = view[offset:offset + UPLOAD_CHUNK_SIZE]
+                    if digest is not None:
+                        # 在线程中计算哈希：首次访问时的缺页读盘发生在这里，不阻塞事件循环；
+                        # 之后发送的是已在内存中的同一块，不再复制
+                        await asyncio.to_thread(digest.update, chunk)
+                    yield chunk
+                    sent += len(chunk)
+                    if self.upload_progress:
+                        self.upload_progress(name, sent, size)
+            finally:
+                view.release()
+        
+        body = chunks()
+        with self.metrics.span("mineru_upload", file=name, bytes=size) as span:
+            try:
+                # 显式给出Content-Length，避免分块传输编码（预签名URL不接受）；
+                # 预签名URL也不允许额外的Content-Type，aiohttp默认会加上一个
+                async with session.put(upload_url, data=body, headers={"Content-Length": str(size)},
+                                       skip_auto_headers=["Content-Type"]) as response:
+                    span["status"] = response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"⚠️ 上传PDF文件异常: {name}: {e}")
+                span["error"] = type(e).__name__
                 return None
-            
-            # 等待10秒后再次查询
-            print("⏳ 等待10秒后重新查询...")
-            time.sleep(10)
+            finally:
+                # 发送中断时生成器停在中途，关闭它以释放对映射的引用
+                await body.aclose()
+            if digest is not None:
+                span["sha256"] = digest.hexdigest()
+        self.metrics.count("mineru_upload_bytes_total", sent)
+        if response.status == 200 and sent != size:
+            print(f"❌ PDF文件上传不完整: {name}，已发送 {sent} / {size} 字节")
+            return None
+        return response.status
+    
+    async def _wait_for_completion(self, batch_id, file_names, max_wait_time):
+        """
+        等待处理完成。batch交给共享的轮询器跟踪，
+        文件一旦有结果即产出 (文件名, 下载URL, 状态)，非done时下载URL为None。
+        """
+        print(f"⏳ 等待处理完成（最大等待时间: {max_wait_time}秒）...")
+        results = self.poller.watch(batch_id, file_names, max_wait_time)
+        for _ in file_names:
+            yield await results.get()
+    
+    async def _fetch_batch_status(self, batch_id):
+        """查询batch内所有文件的处理状态，返回extract_result列表"""
+        url = f"{self.base_url}/api/v4/extract-results/batch/{batch_id}"
+        try:
+            status, result = await self._api_request("GET", url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TransientPollError(e) from e
         
-        print(f"❌ 处理超时（{max_wait_time}秒）")
-        return None
+        if status in TRANSIENT_STATUS_CODES:
+            raise TransientPollError(f"状态码: {status}")
+        if status != 200:
+            raise PollError(f"状态码: {status}")
+        
+        if result["code"] != 0:
+            raise PollError(result.get("msg", "Unknown error"))
+        return result["data"]["extract_result"]
     
-    def _download_and_extract(self, download_url, file_stem, output_dir):
-        """下载并解压ZIP文件"""
+    async def _download_and_extract(self, download_url, file_stem, output_dir):
+        """流式下载ZIP到暂存目录，只解压需要的成员到输出目录"""
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        
+        # 同名文件可能并发转换，暂存文件名需唯一
+        fd, zip_path = tempfile.mkstemp(prefix=f"{file_stem}_", suffix=".zip", dir=self.spool_dir)
+        zip_path = Path(zip_path)
         try:
-            # 创建ZIP存储目录
-            zip_storage_dir = Path("/home/wang2go/Code/CNOOC_RAG/CNOOC_RAG/data/00_raw/arxiv_pdf_mineru")
-            zip_storage_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 创建Markdown输出目录
-            md_output_dir = Path("/home/wang2go/Code/CNOOC_RAG/CNOOC_RAG/data/01_data/arxiv_md")
-            md_output_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 下载ZIP文件
             print("📥 下载转换结果...")
-            zip_response = requests.get(download_url)
+            session = await self._get_session()
+            async with self._download_slots:
+                with os.fdopen(fd, 'wb') as f:
+                    for attempt in range(DOWNLOAD_RETRIES):
+                        status = await self._download_zip(session, download_url, f, file_stem)
+                        if status == 200:
+                            break
+                        if status is not None and status not in TRANSIENT_STATUS_CODES:
+                            print(f"❌ 下载ZIP文件失败，状态码: {status}")
+                            return False
+                        if attempt < DOWNLOAD_RETRIES - 1:
+                            print(f"⚠️ 下载ZIP文件失败（第{attempt + 1}次），稍后重试: {file_stem}")
+                            self.metrics.count("mineru_download_retries_total")
+                            await asyncio.sleep(attempt + 1)
+                    else:
+                        print(f"❌ 下载ZIP文件失败，已重试{DOWNLOAD_RETRIES}次: {file_stem}")
+                        return False
             
-            if zip_response.status_code == 200:
-                zip_filename = f"{file_stem}_converted.zip"
-                zip_path = zip_storage_dir / zip_filename
-                
-                with open(zip_path, 'wb') as f:
-                    f.write(zip_response.content)
-                
-                print(f"✅ ZIP文件下载成功: {zip_path}")
-                
-                # 解压ZIP文件到临时目录
-                print("📂 解压ZIP文件...")
-                temp_extract_dir = zip_storage_dir / f"{file_stem}_temp"
-                temp_extract_dir.mkdir(exist_ok=True)
-                
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(temp_extract_dir)
-                
-                print(f"✅ 文件解压成功: {temp_extract_dir}")
-                
-                # 查找并移动Markdown文件到指定目录
-                success = self._organize_extracted_files(temp_extract_dir, md_output_dir, file_stem)
-                
-                # 删除ZIP文件和临时解压目录
-                print("🗑️ 清理临时文件...")
-                zip_path.unlink()  # 删除ZIP文件
-                
-                # 删除临时解压目录
-                import shutil
-                shutil.rmtree(temp_extract_dir)
-                
-                print("✅ 临时文件清理完成")
-                
-                return success
-            else:
-                print(f"❌ 下载ZIP文件失败，状态码: {zip_response.status_code}")
-                return False
-                
+            print(f"✅ ZIP文件下载成功: {zip_path} ({zip_path.stat().st_size / 1024:.1f} KB)")
+            
+            # 解压和后处理是CPU/磁盘操作，放到线程中进行，不阻塞事件循环
+            return await asyncio.to_thread(self._extract_zip, zip_path, output_dir, file_stem)
+        
         except Exception as e:
             print(f"❌ 下载解压异常: {e}")
             return False
+        
+        finally:
+            zip_path.unlink(missing_ok=True)
     
-    def _organize_extracted_files(self, extract_dir, output_dir, file_stem):
-        """整理解压后的文件"""
-        try:
-            # 查找Markdown文件 - 尝试多种可能的文件名
-            md_patterns = ["**/full.md", "**/*.md", "**/content.md", "**/output.md", "**/auto/*.md"]
-            md_files = []
-            
-            for pattern in md_patterns:
-                md_files = list(extract_dir.glob(pattern))
-                if md_files:
-                    print(f"📋 找到Markdown文件，模式: {pattern}")
-                    break
-            
-            if md_files:
-                # 选择最大的Markdown文件（通常是主文件）
-                main_md = max(md_files, key=lambda x: x.stat().st_size)
-                target_md = output_dir / f"{file_stem}.md"
-                
-                # 如果目标文件已存在，先删除
-                if target_md.exists():
-                    target_md.unlink()
-                
-                # 复制文件内容（避免跨设备移动问题）
-                with open(main_md, 'r', encoding='utf-8') as src:
-                    content = src.read()
-                
-                with open(target_md, 'w', encoding='utf-8') as dst:
-                    dst.write(content)
-                
-                file_size_kb = target_md.stat().st_size / 1024
-                print(f"📝 Markdown文件已保存: {target_md} ({file_size_kb:.1f} KB)")
-                
-                return True
-            else:
-                print("⚠️ 未找到Markdown文件")
-                # 列出所有文件以便调试
-                all_files = list(extract_dir.glob("**/*"))
-                print("📁 解压后的所有文件:")
-                for file in all_files[:10]:  # 显示前10个文件
-                    if file.is_file():
-                        size_kb = file.stat().st_size / 1024
-                        print(f"   - {file.name} ({size_kb:.1f} KB)")
-                
-                return False
-                
-        except Exception as e:
-            print(f"❌ 整理文件异常: {e}")
+    async def _download_zip(self, session, download_url, f, file_stem):
+        """
+        下载一次ZIP，从头写入f（重试时覆盖上次写了一半的内容）
+        
+        Returns:
+            int: 状态码，网络异常时为None
+        """
+        f.seek(0)
+        f.truncate()
+        with self.metrics.span("mineru_download", file=file_stem) as span:
+            try:
+                async with session.get(download_url) as zip_response:
+                    span["status"] = zip_response.status
+                    if zip_response.status != 200:
+                        return zip_response.status
+                    async for chunk in zip_response.content.iter_chunked(ZIP_CHUNK_SIZE):
+                        f.write(chunk)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"⚠️ 下载ZIP文件异常: {file_stem}: {e}")
+                span["error"] = type(e).__name__
+                return None
+            span["bytes"] = f.tell()
+        self.metrics.count("mineru_download_bytes_total", span["bytes"])
+        return 200
+    
+    def _extract_zip(self, zip_path, output_dir, file_stem):
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref, \
+                self.metrics.span("mineru_extract", file=file_stem) as span:
+            span["success"] = self._extract_members(zip_ref, output_dir, file_stem)
+            return span["success"]
+    
+    async def close(self):
+        """停止轮询任务，关闭自己创建的会话"""
+        await self.poller.close()
+        if self._owns_session and self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    @staticmethod
+    def _select_markdown_member(zip_ref):
+        """选择主Markdown文件：优先full.md，否则取最大的.md文件"""
+        md_members = [info for info in zip_ref.infolist()
+                      if not info.is_dir() and info.filename.lower().endswith('.md')]
+        full_md = [info for info in md_members if PurePosixPath(info.filename).name == 'full.md']
+        candidates = full_md or md_members
+        if not candidates:
+            return None
+        return max(candidates, key=lambda info: info.file_size)
+    
+    def _extract_members(self, zip_ref, output_dir, file_stem):
+        """把主Markdown文件（以及extra_members匹配的成员）直接解压到目标路径"""
+        main_md = self._select_markdown_member(zip_ref)
+        if main_md is None:
+            print("⚠️ 未找到Markdown文件")
+            print("📁 ZIP中的文件:")
+            for info in zip_ref.infolist()[:10]:  # 显示前10个文件
+                if not info.is_dir():
+                    print(f"   - {info.filename} ({info.file_size / 1024:.1f} KB)")
             return False
+        
+        print(f"📋 找到Markdown文件: {main_md.filename}")
+        target_md = output_dir / f"{file_stem}.md"
+        if self.postprocessors:
+            raw_md = self._raw_path(file_stem)
+            if raw_md:
+                self._extract_member(zip_ref, main_md, raw_md)
+            self._postprocess_member(zip_ref, main_md, target_md)
+        else:
+            self._extract_member(zip_ref, main_md, target_md)
+        print(f"📝 Markdown文件已保存: {target_md} ({target_md.stat().st_size / 1024:.1f} KB)")
+        
+        if self.extra_members:
+            asset_dir = output_dir / file_stem
+            for info in zip_ref.infolist():
+                if info.is_dir() or info is main_md:
+                    continue
+                if any(fnmatch.fnmatch(info.filename, pattern) for pattern in self.extra_members):
+                    member_path = PurePosixPath(info.filename)
+                    if member_path.is_absolute() or '..' in member_path.parts:
+                        continue
+                    self._extract_member(zip_ref, info, asset_dir.joinpath(*member_path.parts))
+        
+        return True
+    
+    @staticmethod
+    def _extract_member(zip_ref, info, target):
+        """分块解压单个成员，先写临时文件再原子替换目标文件"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_target = target.with_name(f"{target.name}.part")
+        with zip_ref.open(info) as src, open(tmp_target, 'wb') as dst:
+            shutil.copyfileobj(src, dst, ZIP_CHUNK_SIZE)
+        os.replace(tmp_target, target)
+    
+    def _postprocess_member(self, zip_ref, info, target):
+        """边解压边经过后处理钩子，结果写临时文件后原子替换目标文件"""
+        def open_lines():
+            # 与文本模式读取解压后的文件一致：UTF-8、通用换行符
+            with zip_ref.open(info) as member, io.TextIOWrapper(member, encoding='utf-8') as text:
+                yield from iter_lines(text)
+        
+        for hook in self.postprocessors:
+            open_lines = partial(hook, open_lines)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_output(target) as f:
+            write_lines(f, open_lines())
+
+class MinerUConverter:
+    """
+    AsyncMinerUConverter的同步接口
+    
+    转换在后台线程的事件循环中进行；多个线程可以同时调用，所有文件共享同一个
+    事件循环、连接池、轮询任务和配额。参数与AsyncMinerUConverter相同，
+    in_flight_limiter也可以是线程版的InFlightLimiter（按其上限换成异步版本）。
+    """
+    
+    def __init__(self, token, in_flight_limiter=None, **kwargs):
+        if isinstance(in_flight_limiter, InFlightLimiter):
+            in_flight_limiter = AsyncInFlightLimiter(in_flight_limiter.limit)
+        self.engine = AsyncMinerUConverter(token, in_flight_limiter=in_flight_limiter, **kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="mineru-loop", daemon=True)
+        self._thread.start()
+    
+    def __getattr__(self, name):
+        # journal、cache、postprocessors、poller等属性直接取自engine
+        if name == "engine":
+            raise AttributeError(name)
+        return getattr(self.engine, name)
+    
+    @property
+    def base_url(self):
+        return self.engine.base_url
+    
+    @base_url.setter
+    def base_url(self, value):
+        self.engine.base_url = value
+    
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def upload_and_convert_pdf(self, pdf_path, output_dir="data/01_data/arxiv_md", max_wait_time=600):
+        """完整的PDF转换流程，见AsyncMinerUConverter.upload_and_convert_pdf"""
+        return self._run(self.engine.upload_and_convert_pdf(pdf_path, output_dir, max_wait_time))
+    
+    def convert_batch(self, pdf_paths, output_dir="data/01_data/arxiv_md", batch_size=10, max_wait_time=600):
+        """批量转换PDF，见AsyncMinerUConverter.convert_batch"""
+        return self.submit_batch(pdf_paths, output_dir, batch_size, max_wait_time).result()
+    
+    def submit_batch(self, pdf_paths, output_dir="data/01_data/arxiv_md", batch_size=10, max_wait_time=600):
+        """
+        提交一批转换但不等待，返回concurrent.futures.Future，其结果与convert_batch相同。
+        可一次提交任意多批，并发数只受限速器和在途文件数限制，不占用额外线程
+        """
+        coro = self.engine.convert_batch(pdf_paths, output_dir, batch_size, max_wait_time)
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+    
+    def close(self):
+        """关闭会话并停止事件循环"""
+        if self._loop.is_closed():
+            return
+        self._run(self.engine.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
 
 def main():
     """主函数 - 测试转换功能"""
+    from dotenv import load_dotenv
     load_dotenv()
     TOKEN = os.getenv("MINERU_API_TOKEN")
     
@@ -296,6 +853,7 @@ def main():
         print("🎉 PDF转换完成！")
     else:
         print("❌ PDF转换失败！")
+    converter.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+MinerU批处理状态轮询器
+在事件循环中用一个后台任务同时跟踪多个batch_id，按指数退避+抖动调度查询，
+并根据观测到的每页处理时间估计下一次查询的时机
+"""
+
+import asyncio
+import heapq
+import random
+import time
+
+from metrics import get_metrics
+
+
+class TransientPollError(Exception):
+    """可重试的查询错误（网络异常、限流、服务端5xx等）"""
+
+
+class PollError(Exception):
+    """不可重试的查询错误，batch内所有未完成文件视为失败"""
+
+
+class _Watch:
+    """一个正在跟踪的batch"""
+
+    def __init__(self, batch_id, deadline, interval):
+        self.batch_id = batch_id
+        self.started = time.monotonic()
+        self.pending = set()
+        # 文件名 -> 等待该文件结果的队列；同一batch可能被多次watch（如恢复时按不同分组重新接入）
+        self.waiters = {}
+        self.deadline = deadline
+        self.interval = interval
+        self.errors = 0
+        self.states = {}
+        # 文件名 -> (首次观测到的已处理页数, 观测时间)
+        self.progress = {}
+        # 文件名 -> 首次观测到running的时间
+        self.running_since = {}
+
+    def add(self, file_names, results):
+        for file_name in file_names:
+            self.pending.add(file_name)
+            self.waiters.setdefault(file_name, []).append(results)
+
+    def put(self, file_name, download_url, state):
+        """文件有结果：放入所有等待该文件的队列"""
+        self.pending.discard(file_name)
+        for results in self.waiters.pop(file_name, []):
+            results.put_nowait((file_name, download_url, state))
+
+
+class BatchPoller:
+    def __init__(self, fetch_status, min_interval=2.0, max_interval=60.0, backoff=1.6, jitter=0.2,
+                 metrics=None):
+        """
+        Args:
+            fetch_status (coroutine function): await fetch_status(batch_id) -> extract_result列表；
+                可重试的错误抛出TransientPollError，其余错误抛出PollError
+            min_interval (float): 最短查询间隔（秒）
+            max_interval (float): 最长查询间隔（秒）
+            backoff (float): 无进展时查询间隔的增长倍数
+            jitter (float): 查询间隔的随机抖动比例
+            metrics (Metrics): 记录查询次数和远端排队、处理耗时，默认使用进程共享的实例
+        """
+        self.fetch_status = fetch_status
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.metrics = metrics or get_metrics()
+        # 所有batch共同估计的每页处理时间（指数滑动平均）
+        self.seconds_per_page = None
+        self._watches = {}
+        self._heap = []
+        # 只在事件循环中访问，无需加锁
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._polls = set()
+
+    def watch(self, batch_id, file_names, max_wait_time):
+        """
+        开始跟踪一个batch（须在事件循环中调用）
+        
+        batch已在跟踪中时，文件并入原有的跟踪，截止时间取两者中较晚的一个
+        
+        Returns:
+            asyncio.Queue: 每个文件有结果时放入 (文件名, 下载URL, 状态)，状态为
+                done / failed / timeout（等待超时）/ error（查询出错）；
+                非done时下载URL为None。共会放入len(file_names)项
+        """
+        now = time.monotonic()
+        results = asyncio.Queue()
+        watch = self._watches.get(batch_id)
+        if watch is None:
+            watch = self._watches[batch_id] = _Watch(batch_id, now + max_wait_time, self.min_interval)
+            self._schedule(watch, now + self.min_interval)
+        else:
+            watch.deadline = max(watch.deadline, now + max_wait_time)
+        watch.add(file_names, results)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="mineru-poller")
+        return results
+
+    def _schedule(self, watch, when):
+        heapq.heappush(self._heap, (when, watch.batch_id))
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            when, batch_id = self._heap[0]
+            delay = when - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._heap)
+            watch = self._watches.get(batch_id)
+            if watch is not None:
+                # 各batch的查询并发进行，一个慢请求不会推迟其他batch
+                poll = asyncio.create_task(self._poll(watch))
+                self._polls.add(poll)
+                poll.add_done_callback(self._polls.discard)
+
+    async def close(self):
+        """停止轮询任务"""
+        tasks = [task for task in [self._task, *self._polls] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def _finish(self, watch, state):
+        """结束跟踪，剩余未完成文件以state结束"""
+        for file_name in list(watch.pending):
+            watch.put(file_name, None, state)
+        self._watches.pop(watch.batch_id, None)
+
+    def _next_delay(self, watch, eta):
+        """根据预计剩余时间或指数退避计算下一次查询的间隔"""
+        if eta is not None:
+            delay = eta
+        else:
+            delay = watch.interval
+            watch.interval = min(self.max_interval, watch.interval * self.backoff)
+        delay = min(self.max_interval, max(self.min_interval, delay))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _poll(self, watch):
+        now = time.monotonic()
+        if now >= watch.deadline:
+            print(f"❌ batch {watch.batch_id} 处理超时")
+            self._finish(watch, "timeout")
+            return
+
+        try:
+            extract_results = await self.fetch_status(watch.batch_id)
+        except TransientPollError as e:
+            self.metrics.count("mineru_polls_total", result="retry")
+            watch.errors += 1
+            print(f"⚠️ 查询batch {watch.batch_id} 状态失败（第{watch.errors}次），稍后重试: {e}")
+            self._schedule(watch, now + self._next_delay(watch, None))
+            return
+        except Exception as e:
+            self.metrics.count("mineru_polls_total", result="error")
+            print(f"❌ 查询batch {watch.batch_id} 状态失败: {e}")
+            self._finish(watch, "error")
+            return
+
+        self.metrics.count("mineru_polls_total", result="ok")
+        watch.errors = 0
+        eta = None
+        for file_result in extract_results:
+            file_name = file_result["file_name"]
+            if file_name not in watch.pending:
+                continue
+            state = file_result["state"]
+            if watch.states.get(file_name) != state:
+                watch.states[file_name] = state
+                print(f"📊 文件 {file_name} 状态: {state}")
+                self._record_transition(watch, file_name, state, now)
+
+            if state == "done":
+                download_url = file_result["full_zip_url"]
+                print(f"✅ 处理完成！下载URL: {download_url}")
+                watch.put(file_name, download_url, state)
+            elif state == "failed":
+                error_msg = file_result.get("err_msg", "Unknown error")
+                print(f"❌ 处理失败: {error_msg}")
+                watch.put(file_name, None, state)
+            else:
+                file_eta = self._estimate_remaining(watch, file_name, file_result.get("extract_progress"), now)
+                if file_eta is not None:
+                    eta = file_eta if eta is None else min(eta, file_eta)
+
+        if not watch.pending:
+            self._finish(watch, None)
+            return
+
+        self._schedule(watch, now + self._next_delay(watch, eta))
+
+    def _record_transition(self, watch, file_name, state, now):
+        """
+        记录远端排队（开始跟踪到首次running）和处理（running到done/failed）的耗时。
+        时间以查询时刻为准，精度受查询间隔限制；未观测到running的文件全部计入处理耗时
+        """
+        if state == "running":
+            watch.running_since[file_name] = now
+            self.metrics.record_span("mineru_remote_queue", watch.started, now,
+                                     batch_id=watch.batch_id, file=file_name)
+        elif state in ("done", "failed"):
+            self.metrics.record_span("mineru_remote_processing", watch.running_since.get(file_name, watch.started),
+                                     now, batch_id=watch.batch_id, file=file_name, state=state)
+
+    def _estimate_remaining(self, watch, file_name, progress, now):
+        """根据已处理页数估计文件剩余处理时间（秒），无法估计时返回None"""
+        if not progress:
+            return None
+        try:
+            extracted = int(progress.get("extracted_pages", 0))
+            total = int(progress.get("total_pages", 0))
+        except (TypeError, ValueError):
+            return None
+        if total <= 0:
+            return None
+
+        first = watch.progress.setdefault(file_name, (extracted, now))
+        pages_done = extracted - first[0]
+        if pages_done > 0:
+            sample = (now - first[1]) / pages_done
+            if self.seconds_per_page is None:
+                self.seconds_per_page = sample
+            else:
+                self.seconds_per_page = 0.7 * self.seconds_per_page + 0.3 * sample
+
+        if self.seconds_per_page is None:
+            return None
+        return max(0, total - extracted) * self.seconds_per_page
@@ -1,45 +1,178 @@
 import os
+import re
 import requests
+import threading
 import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urlparse
 import logging
 
+from config import ARXIV_BASE_URL
+from http_client import get_session
+from metrics import get_metrics
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+class IncompleteDownloadError(requests.exceptions.RequestException):
+    """Raised when a download ends before the advertised length was received."""
+
+
+def _parse_content_range(value):
+    """
+    Parse a "bytes start-end/total" Content-Range header into (start, total).
+    `total` is None when the server reports it as "*".
+    """
+    match = re.match(r'^bytes\s+(\d+)-\d+/(\d+|\*)$', value.strip())
+    if not match:
+        raise IncompleteDownloadError(f"invalid Content-Range header: {value!r}")
+    start, total = match.groups()
+    return int(start), None if total == '*' else int(total)
+
+
+def _content_range_total(value):
+    """Return the total length from a "bytes */total" Content-Range header."""
+    match = re.match(r'^bytes\s+\*/(\d+)$', value.strip())
+    return int(match.group(1)) if match else None
+
+
+def _expected_length(response):
+    """Return the body length to verify against, or None if it is unknown."""
+    if response.headers.get('content-encoding', 'identity').lower() != 'identity':
+        # Content-Length counts the encoded bytes, not what iter_content yields
+        return None
+    length = response.headers.get('content-length')
+    return int(length) if length and length.isdigit() else None
+
+
 class PDFDownloader:
-    def __init__(self, headers):
+    def __init__(self, headers, max_per_host=4, session=None, metrics=None):
         self.headers = headers
+        self.base_url = ARXIV_BASE_URL
+        self.session = session or get_session()
+        self.max_per_host = max_per_host
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+        # Timings and counters of the downloads (see metrics)
+        self.metrics = metrics or get_metrics()
+
+    def _host_slot(self, url):
+        """
+        Return the semaphore that caps concurrent requests to the host of `url`.
+        """
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.max_per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    @contextmanager
+    def _hold_host_slot(self, url):
+        """Hold the host slot of `url`, timing the wait for it."""
+        slot = self._host_slot(url)
+        with self.metrics.timed("pdf_host_slot_wait_seconds"):
+            slot.acquire()
+        try:
+            yield
+        finally:
+            slot.release()
 
     def download_pdf(self, arxiv_id, output_dir, max_retries=3, delay=1):
         """
         Download a single arXiv paper as PDF.
+
+        Data is streamed into `<id>.pdf.part`; an interrupted download resumes
+        from there with a Range request, and the file is renamed to `<id>.pdf`
+        only once its length matches what the server advertised.
         """
-        pdf_url = f"https://arxiv.org/pdf/{arxiv_id}.pdf"
+        with self.metrics.span("pdf_download", arxiv_id=arxiv_id) as span:
+            success = self._download_pdf(arxiv_id, output_dir, max_retries, delay, span)
+            span.setdefault("result", "ok" if success else "failed")
+        self.metrics.count("pdf_downloads_total", result=span["result"])
+        return success
+
+    def _download_pdf(self, arxiv_id, output_dir, max_retries, delay, span):
+        pdf_url = f"{self.base_url}/pdf/{arxiv_id}.pdf"
         filename = f"{arxiv_id}.pdf"
         filepath = output_dir / filename
+        part_path = output_dir / f"{filename}.part"
 
         if filepath.exists():
             logging.info(f"✓ {arxiv_id}: Already exists, skipping")
+            span["result"] = "skipped"
             return True
 
         for attempt in range(max_retries):
+            span["attempts"] = attempt + 1
+            if attempt:
+                self.metrics.count("pdf_download_retries_total")
             try:
-                logging.info(f"📥 Downloading {arxiv_id}... (attempt {attempt + 1}/{max_retries})")
-                response = requests.get(pdf_url, headers=self.headers, stream=True, timeout=30)
-                response.raise_for_status()
-
-                content_type = response.headers.get('content-type', '').lower()
-                if 'pdf' not in content_type:
-                    logging.warning(f"❌ {arxiv_id}: Response is not a PDF (content-type: {content_type})")
-                    return False
-
-                with open(filepath, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-
-                logging.info(f"✅ {arxiv_id}: Downloaded successfully ({filepath.stat().st_size} bytes)")
-                time.sleep(delay)
+                offset = part_path.stat().st_size if part_path.exists() else 0
+                headers = dict(self.headers)
+                if offset:
+                    headers['Range'] = f"bytes={offset}-"
+                    logging.info(f"📥 Resuming {arxiv_id} from byte {offset}... (attempt {attempt + 1}/{max_retries})")
+                    self.metrics.count("pdf_download_resumes_total")
+                else:
+                    logging.info(f"📥 Downloading {arxiv_id}... (attempt {attempt + 1}/{max_retries})")
+
+                # The post-download delay is taken while holding the host slot so
+                # the per-host cap also bounds the request rate.
+                with self._hold_host_slot(pdf_url):
+                    response = self.session.get(pdf_url, headers=headers, stream=True, timeout=30)
+                    span["status"] = response.status_code
+
+                    if response.status_code == 416:
+                        # The .part file already covers the whole resource, or is
+                        # no longer consistent with it.
+                        total = _content_range_total(response.headers.get('content-range', ''))
+                        if total is not None and total == offset:
+                            os.replace(part_path, filepath)
+                            logging.info(f"✅ {arxiv_id}: Downloaded successfully ({offset} bytes)")
+                            return True
+                        part_path.unlink()
+                        raise IncompleteDownloadError(f"range {offset}- not satisfiable, restarting from byte 0")
+
+                    response.raise_for_status()
+
+                    content_type = response.headers.get('content-type', '').lower()
+                    if 'pdf' not in content_type:
+                        logging.warning(f"❌ {arxiv_id}: Response is not a PDF (content-type: {content_type})")
+                        return False
+
+                    if response.status_code == 206:
+                        start, total = _parse_content_range(response.headers.get('content-range', ''))
+                        if start != offset:
+                            part_path.unlink()
+                            raise IncompleteDownloadError(f"server resumed at byte {start} instead of {offset}")
+                        mode = 'ab'
+                        expected_size = total
+                    else:
+                        # Full response: the server ignored the Range header
+                        mode = 'wb'
+                        expected_size = _expected_length(response)
+
+                    received = 0
+                    try:
+                        with open(part_path, mode) as f:
+                            for chunk in response.iter_content(chunk_size=8192):
+                                if chunk:
+                                    f.write(chunk)
+                                    received += len(chunk)
+                    finally:
+                        span["bytes"] = span.get("bytes", 0) + received
+                        self.metrics.count("pdf_download_bytes_total", received)
+
+                    size = part_path.stat().st_size
+                    if expected_size is not None and size != expected_size:
+                        raise IncompleteDownloadError(f"received {size} of {expected_size} bytes")
+
+                    os.replace(part_path, filepath)
+                    logging.info(f"✅ {arxiv_id}: Downloaded successfully ({size} bytes)")
+                    time.sleep(delay)
                 return True
 
             except requests.exceptions.RequestException as e:
@@ -53,3 +186,29 @@ class PDFDownloader:
 
         logging.error(f"❌ {arxiv_id}: Failed after {max_retries} attempts")
         return False
+
+    def download_many(self, arxiv_ids, output_dir, workers=1, **kwargs):
+        """
+        Download several arXiv papers, running up to `workers` downloads at once.
+
+        Yields (arxiv_id, success) tuples in completion order. Extra keyword
+        arguments are passed through to `download_pdf`.
+        """
+        if workers <= 1:
+            for arxiv_id in arxiv_ids:
+                yield arxiv_id, self.download_pdf(arxiv_id, output_dir, **kwargs)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.download_pdf, arxiv_id, output_dir, **kwargs): arxiv_id
+                for arxiv_id in arxiv_ids
+            }
+            for future in as_completed(futures):
+                arxiv_id = futures[future]
+                try:
+                    success = future.result()
+                except Exception as e:
+                    logging.error(f"❌ {arxiv_id}: Unexpected error: {e}")
+                    success = False
+                yield arxiv_id, success
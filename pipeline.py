@@ -0,0 +1,157 @@
+"""
+Streaming search -> download -> convert pipeline.
+
+Each stage runs its own worker threads and hands items to the next stage
+through a bounded queue, so the first papers come out of the converter while
+later ones are still being searched and downloaded, and memory stays bounded
+no matter how large the corpus is. Cleaning is not a stage of its own: the
+converter cleans the Markdown while extracting it (see MinerUConverter
+postprocessors).
+"""
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from metrics import get_metrics
+
+# Marks the end of a stage's input
+_END = object()
+
+
+@dataclass
+class StageStats:
+    name: str
+    succeeded: int = 0
+    failed: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, success):
+        with self._lock:
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+
+class Stage:
+    """
+    A pool of worker threads reading from `inbox` and writing to `outbox`.
+
+    `handle(items)` receives a list of up to `batch_size` items and returns an
+    iterable of (item, output) pairs, where `output` is None for items that
+    failed. Successful outputs are forwarded to `outbox`. When every worker has
+    seen the end of the input, the end marker is forwarded too.
+
+    Time spent waiting for input (the stage is starved) and for room in
+    `outbox` (the next stage is the bottleneck) is recorded in the
+    `pipeline_input_wait_seconds` and `pipeline_output_wait_seconds` metrics.
+    """
+
+    def __init__(self, name, handle, inbox, outbox=None, workers=1, batch_size=1):
+        self.stats = StageStats(name)
+        self.handle = handle
+        self.inbox = inbox
+        self.outbox = outbox
+        self.batch_size = max(1, batch_size)
+        self.metrics = get_metrics()
+        self._remaining = max(1, workers)
+        self._remaining_lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+            for i in range(self._remaining)
+        ]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def _take(self):
+        """Block for one item, then take whatever else is ready, up to batch_size."""
+        with self.metrics.timed("pipeline_input_wait_seconds", stage=self.stats.name):
+            first = self.inbox.get()
+        if first is _END:
+            return None
+        items = [first]
+        while len(items) < self.batch_size:
+            try:
+                item = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END:
+                self.inbox.put(_END)
+                break
+            items.append(item)
+        return items
+
+    def _work(self):
+        while True:
+            items = self._take()
+            if items is None:
+                # Let sibling workers see the end marker too
+                self.inbox.put(_END)
+                break
+            try:
+                results = list(self.handle(items))
+            except Exception as e:
+                logging.error(f"{self.stats.name}: unexpected error: {e}")
+                results = [(item, None) for item in items]
+            for _, output in results:
+                self.stats.record(output is not None)
+                if output is not None and self.outbox is not None:
+                    with self.metrics.timed("pipeline_output_wait_seconds", stage=self.stats.name):
+                        self.outbox.put(output)
+
+        with self._remaining_lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last and self.outbox is not None:
+            self.outbox.put(_END)
+
+
+def run_pipeline(arxiv_ids, downloader, converter, pdf_dir, md_dir,
+                 download_workers=4, convert_workers=4, batch_size=1, queue_size=16):
+    """
+    Stream `arxiv_ids` (any iterable, typically a live search) through
+    download and MinerU conversion into `md_dir`.
+
+    Returns the StageStats of the download and convert stages.
+    """
+    pdf_dir, md_dir = Path(pdf_dir), Path(md_dir)
+    for directory in (pdf_dir, md_dir):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    to_download = queue.Queue(maxsize=queue_size)
+    to_convert = queue.Queue(maxsize=queue_size)
+
+    def download(ids):
+        for arxiv_id in ids:
+            success = downloader.download_pdf(arxiv_id, pdf_dir)
+            yield arxiv_id, pdf_dir / f"{arxiv_id}.pdf" if success else None
+
+    def convert(pdf_paths):
+        results = converter.convert_batch(pdf_paths, str(md_dir), batch_size=len(pdf_paths))
+        for pdf_path in pdf_paths:
+            yield pdf_path, md_dir / f"{pdf_path.stem}.md" if results.get(str(pdf_path)) else None
+
+    stages = [
+        Stage("download", download, to_download, to_convert, workers=download_workers).start(),
+        Stage("convert", convert, to_convert, workers=convert_workers, batch_size=batch_size).start(),
+    ]
+
+    # Blocks whenever the download queue is full, which throttles the search
+    try:
+        for arxiv_id in arxiv_ids:
+            to_download.put(arxiv_id)
+    finally:
+        to_download.put(_END)
+
+    for stage in stages:
+        stage.join()
+    return [stage.stats for stage in stages]
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rate` acquisitions per `per` seconds.
+
+    `capacity` is the largest burst that may go out back to back; the default
+    of 1 spaces requests evenly so no sliding window ever exceeds the rate.
+    """
+
+    def __init__(self, rate, per=60.0, capacity=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.fill_rate = rate / per
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` tokens are available, then take them."""
+        while True:
+            wait = self._take(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1):
+        """Like `acquire`, but wait with asyncio.sleep so the event loop keeps running."""
+        while True:
+            wait = self._take(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def _take(self, tokens):
+        """Take `tokens` tokens if available and return 0, else return the seconds to wait."""
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0
+            return (tokens - self._tokens) / self.fill_rate
+
+
+class InFlightLimiter:
+    """
+    Counting limiter that hands out several slots atomically, so callers that
+    need a whole batch of slots cannot deadlock each other by each holding part
+    of what they need.
+    """
+
+    def __init__(self, limit):
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        self.limit = limit
+        self._in_use = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, count=1):
+        """Block until `count` slots are free and take them. Returns the number taken."""
+        count = min(count, self.limit)
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_use + count <= self.limit)
+            self._in_use += count
+        return count
+
+    def release(self, count=1):
+        with self._cond:
+            self._in_use -= count
+            self._cond.notify_all()
+
+
+class AsyncInFlightLimiter:
+    """
+    asyncio counterpart of InFlightLimiter, for coroutines sharing one event
+    loop. Slots are handed out in one step, like InFlightLimiter.
+    """
+
+    def __init__(self, limit):
+        if limit <= 0:
+            raise ValueError("limit must be positive")
+        self.limit = limit
+        self._in_use = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self, count=1):
+        """Wait until `count` slots are free and take them. Returns the number taken."""
+        count = min(count, self.limit)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_use + count <= self.limit)
+            self._in_use += count
+        return count
+
+    async def release(self, count=1):
+        async with self._cond:
+            self._in_use -= count
+            self._cond.notify_all()
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def normalize_query(query):
+    """Case- and whitespace-insensitive form of a search query."""
+    return ' '.join(query.lower().split())
+
+
+class SearchCache:
+    """
+    On-disk cache of parsed arXiv search result pages.
+
+    Each page is stored as a small JSON file keyed by the normalized query,
+    page size and start offset, holding its IDs and, when the page was parsed
+    for metadata, its records. Entries younger than `ttl` seconds are served
+    without touching the network; older ones keep their ETag/Last-Modified
+    validators so they can be revalidated with a conditional request.
+    """
+
+    def __init__(self, cache_dir, ttl, refresh=False):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        # When set, every entry is treated as stale and must be revalidated
+        self.refresh = refresh
+
+    def _path(self, query, size, start):
+        key = json.dumps([normalize_query(query), size, start])
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, query, size, start):
+        """Return the cached entry dict for a page, or None."""
+        try:
+            with open(self._path(query, size, start), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry):
+        return not self.refresh and time.time() - entry['fetched_at'] < self.ttl
+
+    def put(self, query, size, start, ids, records=None, etag=None, last_modified=None):
+        entry = {
+            'query': normalize_query(query),
+            'size': size,
+            'start': start,
+            'ids': ids,
+            'records': records,
+            'fetched_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+        }
+        path = self._path(query, size, start)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        return entry
+
+    def touch(self, query, size, start, entry):
+        """Mark a revalidated entry as freshly fetched."""
+        return self.put(query, size, start, entry['ids'], entry.get('records'),
+                        entry.get('etag'), entry.get('last_modified'))
+
+    @staticmethod
+    def conditional_headers(entry):
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Markdown分片存储
+把转换得到的Markdown追加到大小有上限的压缩分片中，而不是每篇论文一个文件，
+避免数百万个小文件耗尽inode，也让目录列举和rsync更快
+
+每个分片是一个普通的 .tar.gz（或安装了zstandard时的 .tar.zst），可以直接用
+tar解压；其中每篇文档（tar头+内容）单独压缩为一帧，帧依次拼接。分片旁的
+<分片名>.idx 是偏移索引，每行一篇文档：
+
+    文档ID \t 帧偏移 \t 帧长度 \t 原始字节数
+
+按ID随机读取时只需定位并解压一帧；顺序读取时按索引依次读取各帧
+"""
+
+import gzip
+import tarfile
+import threading
+import time
+from importlib.util import find_spec
+from pathlib import Path
+
+# 分片格式 -> 文件后缀；zstd需要可选依赖zstandard
+FORMATS = {"gz": ".tar.gz", "zst": ".tar.zst"}
+DEFAULT_FORMAT = "gz"
+
+# 各格式的压缩级别
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# 顺序读取分片时的缓冲区大小
+READ_BUFFER_SIZE = 4 * 1024 * 1024
+
+_BLOCK = tarfile.BLOCKSIZE
+# tar归档结尾的两个全零块
+_END_OF_ARCHIVE = b"\0" * (2 * _BLOCK)
+
+
+def _compress(data, fmt):
+    if fmt == "zst":
+        import zstandard
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _decompress(frame, fmt):
+    if fmt == "zst":
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(frame)
+    return gzip.decompress(frame)
+
+
+def _padded(size):
+    return -(-size // _BLOCK) * _BLOCK
+
+
+def _tar_member(doc_id, data):
+    """一篇文档对应的tar成员：头部（名称过长时含PAX扩展头）+ 内容 + 补齐到512字节"""
+    info = tarfile.TarInfo(f"{doc_id}.md")
+    info.size = len(data)
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    return info.tobuf(format=tarfile.PAX_FORMAT) + data + b"\0" * (_padded(len(data)) - len(data))
+
+
+def _member_data(block, size):
+    """从tar成员中取出内容：内容位于补齐后的最后 _padded(size) 字节的开头"""
+    start = len(block) - _padded(size)
+    return block[start:start + size]
+
+
+def _shard_format(path):
+    for fmt, suffix in FORMATS.items():
+        if path.name.endswith(suffix):
+            return fmt
+    raise ValueError(f"未知的分片格式: {path.name}")
+
+
+def _index_path(shard_path):
+    return shard_path.with_name(f"{shard_path.name}.idx")
+
+
+def _read_index(shard_path):
+    """读取分片的偏移索引，返回 [(文档ID, 偏移, 长度, 原始字节数)]；忽略写了一半的最后一行"""
+    entries = []
+    index_path = _index_path(shard_path)
+    if not index_path.exists():
+        return entries
+    with open(index_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            doc_id, offset, length, size = line.rstrip("\n").split("\t")
+            entries.append((doc_id, int(offset), int(length), int(size)))
+    return entries
+
+
+def _read_document(shard_path, offset, length, size):
+    with open(shard_path, "rb") as f:
+        f.seek(offset)
+        frame = f.read(length)
+    return _member_data(_decompress(frame, _shard_format(shard_path)), size)
+
+
+def _load_locations(shards):
+    """各文档ID最后一次写入的位置：{文档ID: (分片路径, 偏移, 长度, 原始字节数)}"""
+    locations = {}
+    for shard_path in shards:
+        for doc_id, offset, length, size in _read_index(shard_path):
+            locations[doc_id] = (shard_path, offset, length, size)
+    return locations
+
+
+def list_shards(shard_dir):
+    """按编号顺序列出目录中的所有分片"""
+    shard_dir = Path(shard_dir)
+    suffixes = tuple(FORMATS.values())
+    return sorted(p for p in shard_dir.glob("shard-*") if p.name.endswith(suffixes))
+
+
+class ShardWriter:
+    def __init__(self, shard_dir, max_bytes, fmt=DEFAULT_FORMAT):
+        """
+        Args:
+            shard_dir (str): 分片目录
+            max_bytes (int): 单个分片的大小上限（字节），写满后开始新分片
+            fmt (str): 分片格式，FORMATS中的键
+
+        同一目录同时只能有一个ShardWriter；多个转换线程可以共用一个。
+        与已存内容完全相同的文档（如再次命中转换缓存）不会重复写入
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"不支持的分片格式 {fmt!r}，可用: {sorted(FORMATS)}")
+        if fmt == "zst" and find_spec("zstandard") is None:
+            raise ValueError("zst格式的分片需要安装 zstandard")
+        self.shard_dir = Path(shard_dir)
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.format = fmt
+        self._lock = threading.Lock()
+        self._shard = None
+        self._index = None
+        self._size = 0
+        self._count = 0
+        self._next_number = 0
+        self._open_last_shard()
+
+    def _open_last_shard(self):
+        """
+        继续写入最后一个未写满的同格式分片：截掉最后一篇已索引文档之后的内容
+        （归档结尾块，或中断时写了一半的帧），使分片和索引保持一致
+        """
+        shards = list_shards(self.shard_dir)
+        self._locations = _load_locations(shards)
+        if shards:
+            self._next_number = int(shards[-1].name.split(".")[0].split("-")[1]) + 1
+            last = shards[-1]
+            if last.name.endswith(FORMATS[self.format]):
+                entries = _read_index(last)
+                end = entries[-1][1] + entries[-1][2] if entries else 0
+                if end < self.max_bytes:
+                    with open(last, "r+b") as f:
+                        f.truncate(end)
+                    with open(_index_path(last), "w", encoding="utf-8") as f:
+                        f.writelines(f"{doc_id}\t{offset}\t{length}\t{size}\n"
+                                     for doc_id, offset, length, size in entries)
+                    self._open(last, end, len(entries))
+
+    def _open(self, path, size=0, count=0):
+        self.shard_path = path
+        self._shard = open(path, "ab")
+        self._index = open(_index_path(path), "a", encoding="utf-8")
+        self._size = size
+        self._count = count
+
+    def _open_next(self):
+        path = self.shard_dir / f"shard-{self._next_number:05d}{FORMATS[self.format]}"
+        self._next_number += 1
+        self._open(path)
+
+    def _finish(self):
+        """写入tar归档结尾块并关闭当前分片"""
+        if self._shard is None:
+            return
+        self._shard.write(_compress(_END_OF_ARCHIVE, self.format))
+        self._shard.close()
+        self._index.close()
+        self._shard = self._index = None
+
+    def __contains__(self, doc_id):
+        with self._lock:
+            return doc_id in self._locations
+
+    def add(self, doc_id, data):
+        """
+        追加一篇文档（bytes），返回所在分片的路径
+
+        压缩在调用线程中进行，只有写入分片和索引时持有锁
+        """
+        if "\t" in doc_id or "\n" in doc_id:
+            raise ValueError(f"文档ID不能包含制表符或换行符: {doc_id!r}")
+        with self._lock:
+            stored = self._locations.get(doc_id)
+        if stored and stored[3] == len(data) and _read_document(*stored) == data:
+            return stored[0]
+        frame = _compress(_tar_member(doc_id, data), self.format)
+        with self._lock:
+            if self._shard is None:
+                self._open_next()
+            elif self._count and self._size + len(frame) > self.max_bytes:
+                self._finish()
+                self._open_next()
+            offset = self._size
+            self._shard.write(frame)
+            self._shard.flush()
+            # 先写分片再写索引：中断时索引中不会有不完整的帧
+            self._index.write(f"{doc_id}\t{offset}\t{len(frame)}\t{len(data)}\n")
+            self._index.flush()
+            self._locations[doc_id] = (self.shard_path, offset, len(frame), len(data))
+            self._size += len(frame)
+            self._count += 1
+            return self.shard_path
+
+    def add_file(self, doc_id, path):
+        """追加一个文件的内容，返回所在分片的路径"""
+        return self.add(doc_id, Path(path).read_bytes())
+
+    def close(self):
+        with self._lock:
+            self._finish()
+
+
+class ShardReader:
+    def __init__(self, shard_dir):
+        """
+        读取ShardWriter写入的分片目录
+
+        同一文档ID写入过多次时（如重新转换），以最后写入的为准
+        """
+        self.shard_dir = Path(shard_dir)
+        self._locations = None
+
+    def _load_index(self):
+        if self._locations is None:
+            self._locations = _load_locations(list_shards(self.shard_dir))
+        return self._locations
+
+    def __contains__(self, doc_id):
+        return doc_id in self._load_index()
+
+    def __len__(self):
+        return len(self._load_index())
+
+    def ids(self):
+        return list(self._load_index())
+
+    def locations(self):
+        """{文档ID: (分片路径, 偏移, 帧长度, 原始字节数)}，只含各文档最后写入的版本"""
+        return dict(self._load_index())
+
+    def get_bytes(self, doc_id):
+        """按ID读取一篇文档（bytes）；不存在时抛出KeyError"""
+        return _read_document(*self._load_index()[doc_id])
+
+    def get(self, doc_id):
+        """按ID读取一篇文档的Markdown文本；不存在时抛出KeyError"""
+        return self.get_bytes(doc_id).decode("utf-8")
+
+    def iter_bytes(self):
+        """按分片和写入顺序依次读取所有文档，生成 (文档ID, bytes)；被覆盖的旧版本跳过"""
+        latest = self._load_index()
+        for shard_path in list_shards(self.shard_dir):
+            fmt = _shard_format(shard_path)
+            with open(shard_path, "rb", buffering=READ_BUFFER_SIZE) as f:
+                position = 0
+                for doc_id, offset, length, size in _read_index(shard_path):
+                    if latest.get(doc_id, (None, None))[:2] != (shard_path, offset):
+                        continue
+                    if offset != position:
+                        f.seek(offset)
+                    frame = f.read(length)
+                    position = offset + length
+                    yield doc_id, _member_data(_decompress(frame, fmt), size)
+
+    def __iter__(self):
+        """依次生成 (文档ID, Markdown文本)"""
+        for doc_id, data in self.iter_bytes():
+            yield doc_id, data.decode("utf-8")
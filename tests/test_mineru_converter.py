@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from job_journal import JobJournal
+from mineru_converter import MinerUConverter
+from stub_servers import MinerUStub
+from synthetic import make_pdf
+
+
+def _converter(tmp_path, url):
+    converter = MinerUConverter("token", spool_dir=tmp_path / "spool", journal=JobJournal(tmp_path / "journal.db"))
+    converter.base_url = url
+    converter.poller.min_interval = 0.05
+    return converter
+
+
+def test_resume_reattaches_one_batch_from_several_calls(tmp_path):
+    """中断后按不同分组恢复：同一batch的文件分在两次submit_batch中重新接入，都能完成"""
+    pdf_paths = []
+    for n in range(4):
+        pdf_path = tmp_path / f"p{n}.pdf"
+        pdf_path.write_bytes(make_pdf(2, seed=n))
+        pdf_paths.append(pdf_path)
+
+    with MinerUStub(processing_time=0.2) as mineru:
+        converter = _converter(tmp_path, mineru.url)
+        assert all(converter.convert_batch(pdf_paths, str(tmp_path / "md"), batch_size=4).values())
+        converter.close()
+        converter.journal.close()
+
+        # 模拟上传后中断：4个文件都在同一batch中，尚无远端结果和输出
+        journal = JobJournal(tmp_path / "journal.db")
+        for pdf_path in pdf_paths:
+            journal.update(pdf_path, remote_state=None, result_url=None, output_path=None)
+        journal.close()
+
+        converter = _converter(tmp_path, mineru.url)
+        futures = [converter.submit_batch(pdf_paths[:2], str(tmp_path / "md2"), batch_size=2),
+                   converter.submit_batch(pdf_paths[2:], str(tmp_path / "md2"), batch_size=2)]
+        results = {}
+        for future in futures:
+            results.update(future.result(timeout=30))
+        converter.close()
+        converter.journal.close()
+
+    assert len(results) == 4 and all(results.values())
+    assert sorted(path.name for path in (tmp_path / "md2").glob("*.md")) == ["p0.md", "p1.md", "p2.md", "p3.md"]
@@ -0,0 +1,25 @@
+import asyncio
+
+from mineru_poller import BatchPoller
+
+
+def test_watching_one_batch_twice_delivers_to_both():
+    """同一batch被分两次watch（如恢复时按不同分组重新接入）时，两个队列都能收到各自文件的结果"""
+    async def fetch_status(batch_id):
+        return [{"file_name": name, "state": "done", "full_zip_url": f"http://result/{name}.zip"}
+                for name in ("a.pdf", "b.pdf", "c.pdf", "d.pdf")]
+
+    async def run():
+        poller = BatchPoller(fetch_status, min_interval=0.01)
+        first = poller.watch("batch-1", ["a.pdf", "b.pdf"], 10)
+        second = poller.watch("batch-1", ["c.pdf", "d.pdf"], 10)
+        try:
+            got = [await asyncio.wait_for(queue.get(), 5) for queue in (first, first, second, second)]
+        finally:
+            await poller.close()
+        return got
+
+    got = asyncio.run(run())
+    assert sorted(name for name, _, _ in got[:2]) == ["a.pdf", "b.pdf"]
+    assert sorted(name for name, _, _ in got[2:]) == ["c.pdf", "d.pdf"]
+    assert {state for _, _, state in got} == {"done"}
@@ -0,0 +1,33 @@
+import os
+
+from shard_store import ShardReader, ShardWriter, list_shards
+
+
+def _document(n):
+    # 不可压缩的内容，使分片大小可以预估
+    return os.urandom(300) + f"doc{n}".encode()
+
+
+def test_resume_then_roll_over(tmp_path):
+    documents = {f"id{n}": _document(n) for n in range(12)}
+    ids = list(documents)
+
+    writer = ShardWriter(tmp_path, max_bytes=2000)
+    for doc_id in ids[:4]:
+        writer.add(doc_id, documents[doc_id])
+    writer.close()
+    assert len(list_shards(tmp_path)) == 1
+
+    # 重新打开后继续写入未写满的分片，写满后开始新分片
+    writer = ShardWriter(tmp_path, max_bytes=2000)
+    for doc_id in ids[4:]:
+        writer.add(doc_id, documents[doc_id])
+    writer.close()
+    shards = list_shards(tmp_path)
+    assert len(shards) > 1
+    assert len({shard.name for shard in shards}) == len(shards)
+
+    reader = ShardReader(tmp_path)
+    assert dict(reader.iter_bytes()) == documents
+    for doc_id, data in documents.items():
+        assert reader.get_bytes(doc_id) == data